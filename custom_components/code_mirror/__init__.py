@@ -23,7 +23,7 @@ from homeassistant.helpers.storage import Store
 
 from .const import DOMAIN, NAME
 from .api import CodeMirrorApiView
-from .websocket import async_register_websockets, async_stop_watcher
+from .websocket import SUBSCRIBERS_KEY, async_register_websockets, async_stop_watcher
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +31,13 @@ _LOGGER = logging.getLogger(__name__)
 STORAGE_VERSION = 1
 STORAGE_KEY = f"{DOMAIN}.storage"
 
+# hass.data key of the API view, kept once its config entry is unloaded
+API_VIEW_KEY = "code_mirror_api_view"
+
+# URL the integration folder is served under, and its location in the config dir
+STATIC_URL_PATH = f"/local/{DOMAIN}"
+STATIC_DIR_PARTS = ("custom_components", DOMAIN)
+
 # This integration is configured via config entries (UI)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
@@ -48,16 +55,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
     data = await store.async_load() or {}
 
-    config_dir = Path(hass.config.config_dir)
-    api_view = CodeMirrorApiView(config_dir, store, data)
-    hass.http.register_view(api_view)
+    # Views cannot be unregistered, a reloaded entry reuses the registered one
+    if (api_view := hass.data.get(API_VIEW_KEY)) is None:
+        config_dir = Path(hass.config.config_dir)
+        api_view = hass.data[API_VIEW_KEY] = CodeMirrorApiView(hass, config_dir, store, data)
+        hass.http.register_view(api_view)
+    else:
+        api_view.async_load(store, data)
     
     # Register WebSocket commands
     async_register_websockets(hass)
 
     # Register Static Paths with fallback for different HA versions
-    url_path = f"/local/{DOMAIN}"
-    path_on_disk = str(hass.config.path("custom_components", DOMAIN))
+    url_path = STATIC_URL_PATH
+    path_on_disk = hass.config.path(*STATIC_DIR_PARTS)
     
     if hasattr(hass.http, "async_register_static_paths"):
         await hass.http.async_register_static_paths([
@@ -78,7 +89,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sidebar_title=NAME,
         sidebar_icon="mdi:file-document-edit",
         frontend_url_path=DOMAIN,
-        config={"url": f"/local/{DOMAIN}/panels/panel_custom.html"},
+        config={"url": f"{STATIC_URL_PATH}/panels/panel_custom.html"},
         require_admin=True,
     )
 
@@ -88,5 +99,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     frontend.async_remove_panel(hass, DOMAIN)
     async_stop_watcher(hass)
+    hass.data.pop(SUBSCRIBERS_KEY, None)
+    hass.data[API_VIEW_KEY].async_unload()
     hass.data[DOMAIN].pop(entry.entry_id, None)
     return True
@@ -5,21 +5,63 @@ import logging
 import os
 import asyncio
 import signal
-from typing import Any
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import accumulate, islice
+from typing import Any, TypeVar
 from pathlib import Path
 
+import orjson
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED, __version__ as HA_VERSION
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.storage import Store
 
 from .const import BINARY_EXTENSIONS
-from .util import json_message, json_response
+from .util import etag_response, json_body_response, json_message, json_response
 from .syntax_checker import SyntaxChecker
 from .file_manager import FileManager
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Threads of the pool running blocking file operations and checks
+EXECUTOR_WORKERS = 4
+
+# Maximum number of entities returned by get_entities
+MAX_ENTITIES = 1000
+# Separators of the entity search index, between the fields of an entity and
+# between entities, control characters no search can contain
+ENTITY_FIELD_SEP = "\x1f"
+ENTITY_RECORD_SEP = "\x1e"
+
+# Seconds a reload waits after a save, so a burst of saves reloads once
+RELOAD_DELAY = 1.0
+# Root config files reloaded after being saved, with the domain to reload
+RELOAD_ON_SAVE = {
+    "automations.yaml": "automation",
+    "scripts.yaml": "script",
+    "scenes.yaml": "scene",
+    "groups.yaml": "group",
+}
+
+# GET actions whose result rarely changes, answered with an ETag so the browser
+# can revalidate its copy instead of downloading it again
+ETAG_ACTIONS = frozenset({"get_settings", "get_version", "list_files"})
+
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
+
+def _qbool(params, key: str) -> bool:
+    """Return a boolean query parameter, false when missing or empty."""
+    value = params.get(key)
+    return bool(value) and value.lower() in _TRUTHY
+
+
 class CodeMirrorApiView(HomeAssistantView):
     """View to handle API requests for CodeMirror."""
 
@@ -27,14 +69,147 @@ class CodeMirrorApiView(HomeAssistantView):
     name = "api:code_mirror"
     requires_auth = False # We handle auth manually to support WebSockets via query param
 
-    def __init__(self, config_dir: Path, store: Store, data: dict) -> None:
+    def __init__(self, hass: HomeAssistant, config_dir: Path, store: Store, data: dict) -> None:
         """Initialize the view."""
+        self.hass = hass
         self.config_dir = config_dir
+        self._reload_on_save = {
+            path: partial(hass.services.async_call, domain, "reload")
+            for path, domain in RELOAD_ON_SAVE.items()
+        }
+        # Reloads waiting for saves of their file to settle, by path
+        self._reload_handles: dict[str, asyncio.TimerHandle] = {}
+        # Executor jobs currently running, by action and arguments
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._integration_version: str | None = None
+        # Casefolded entity ids and friendly names searched by get_entities,
+        # only rebuilt once an entity is added, removed or renamed
+        self._entity_index: tuple[str, list[int], list[str]] | None = None
+        # Pool of the loaded config entry, None while the entry is unloaded
+        self._executor: ThreadPoolExecutor | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+        self.async_load(store, data)
+
+        # Action name -> handler, looked up once per request
+        self._get_actions = {
+            "list_files": self._get_list_files,
+            "list_directory": self._get_list_directory,
+            "read_file": self._get_read_file,
+            "serve_file": self._get_serve_file,
+            "global_search": self._get_global_search,
+            "get_file_stat": self._get_get_file_stat,
+            "download_folder": self._get_download_folder,
+            "get_settings": self._get_get_settings,
+            "get_version": self._get_get_version,
+        }
+        self._post_actions = {
+            # Settings
+            "save_settings": self._post_save_settings,
+            # Files
+            "write_file": self._post_write_file,
+            "create_file": self._post_create_file,
+            "create_folder": self._post_create_folder,
+            "delete": self._post_delete,
+            "copy": self._post_copy,
+            "rename": self._post_rename,
+            "upload_file": self._post_upload_file,
+            "download_multi": self._post_download_multi,
+            "delete_multi": self._post_delete_multi,
+            "move_multi": self._post_move_multi,
+            "check_yaml": self._post_check_yaml,
+            "check_jinja": self._post_check_jinja,
+            # Misc
+            "restart_home_assistant": self._post_restart_home_assistant,
+            "get_entities": self._post_get_entities,
+            "global_search": self._post_global_search,
+            "global_replace": self._post_global_replace,
+        }
+
+    @callback
+    def async_load(self, store: Store, data: dict) -> None:
+        """Start serving a config entry.
+
+        The view stays registered once the entry is unloaded, a reloaded entry
+        is served by the same view with new executors.
+        """
         self.store = store
         self.data = data
 
-        self.syntax_checker = SyntaxChecker(None, data)
-        self.file = FileManager(None, config_dir)
+        # Blocking work (file system walks, searches, syntax checks) runs in a
+        # pool of its own so it does not compete with Home Assistant's executor
+        self._executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="code_mirror")
+        self._unsub_stop = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown)
+        # Entities changed while unloaded were not seen, the index is rebuilt
+        self._entity_index = None
+        self._unsub_state_changed = self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+
+        self.syntax_checker = SyntaxChecker(self.hass, data)
+        self.file = FileManager(self.hass, self.config_dir, self._executor)
+
+    @callback
+    def async_unload(self) -> None:
+        """Release the executors and listeners of the unloaded config entry."""
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+        self._unsub_state_changed()
+        self._release()
+
+    @callback
+    def _async_shutdown(self, event: Event) -> None:
+        """Drop the queued blocking work so it does not hold up Home Assistant stopping."""
+        self._release()
+
+    @callback
+    def _release(self) -> None:
+        """Stop the executors, cancelling the blocking work not started yet, and the pending reloads."""
+        # Either removed or fired, the stop listener must not be removed again
+        self._unsub_stop = None
+        # Home Assistant stopping may release the executors before the entry is unloaded
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            # Requests are refused until the entry is loaded again
+            self._executor = None
+            self.file.shutdown()
+        for handle in self._reload_handles.values():
+            handle.cancel()
+        self._reload_handles.clear()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Drop the entity index when an entity is added, removed or renamed."""
+        if self._entity_index is None:
+            return
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            old_state is None
+            or new_state is None
+            or old_state.attributes.get("friendly_name") != new_state.attributes.get("friendly_name")
+        ):
+            self._entity_index = None
+
+    def _run_in_executor(self, func: Callable[..., _T], *args: Any) -> asyncio.Future[_T]:
+        """Run a blocking function in the integration executor.
+
+        Changes to the files run in Home Assistant's executor instead, see
+        FileManager._run_in_executor.
+        """
+        return self.hass.loop.run_in_executor(self._executor, func, *args)
+
+    async def _run_coalesced(self, key: tuple, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func in the executor, sharing the result with identical concurrent calls."""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._run_in_executor(func, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # A disconnecting client must not cancel the job for the other waiters
+        return await asyncio.shield(future)
+
+    async def _global_search(self, *args: Any) -> list[dict]:
+        """Search all files, sharing the scan with identical searches in progress."""
+        return await self._run_coalesced(("global_search", *args), self.file.global_search, *args)
 
     async def _authenticate(self, request):
         """Authenticate request via header or token query param."""
@@ -45,7 +220,7 @@ class CodeMirrorApiView(HomeAssistantView):
         # 2. Query param auth (for WebSockets)
         token = request.query.get("token")
         if token:
-            refresh_token = request.app["hass"].auth.async_validate_access_token(token)
+            refresh_token = self.hass.auth.async_validate_access_token(token)
             if refresh_token:
                 return refresh_token.user
             else:
@@ -55,181 +230,275 @@ class CodeMirrorApiView(HomeAssistantView):
         
         return None
 
-    def _update_hass(self, hass: HomeAssistant) -> None:
-        """Update hass instance in managers."""
-        self.syntax_checker.hass = hass
-        self.file.hass = hass
-
-    async def get(self, request: web.Request) -> web.Response:
+    async def get(self, request: web.Request) -> web.StreamResponse:
         """Handle GET requests."""
         user = await self._authenticate(request)
         if not user:
             return web.Response(status=401, text="Unauthorized")
+        # The view stays registered while its config entry is unloaded
+        if self._executor is None: return json_message("CodeMirror is not loaded", status_code=503)
 
         params = request.query
         action = params.get("action")
         if not action: return json_message("Missing action", status_code=400)
-        
-        hass = request.app["hass"]
-        self._update_hass(hass)
-
-        if action == "list_files":
-            show_hidden = params.get("show_hidden", "false").lower() == "true"
-            files = await hass.async_add_executor_job(self.file.list_files, show_hidden)
-            return json_response(files)
-        if action == "list_directory":
-            path = params.get("path", "")  # Empty string = root
-            show_hidden = params.get("show_hidden", "false").lower() == "true"
-            result = await hass.async_add_executor_job(self.file.list_directory, path, show_hidden)
-            return json_response(result)
-        if action == "read_file":
-            path = params.get("path")
-            if not path: return json_message("Missing path", status_code=400)
-            return await self.file.read_file(path)
-        if action == "serve_file":
-            path = params.get("path")
-            if not path: return web.Response(status=400, text="Missing path")
-            return await self.file.serve_file(path)
-        if action == "global_search":
-            results = await hass.async_add_executor_job(
-                self.file.global_search, 
-                params.get("query"), 
-                params.get("case_sensitive", "false").lower() == "true", 
-                params.get("use_regex", "false").lower() == "true",
-                params.get("match_word", "false").lower() == "true",
-                params.get("include", ""),
-                params.get("exclude", "")
-            )
-            return json_response(results)
-        if action == "get_file_stat":
-            path = params.get("path")
-            if not path: return json_message("Missing path", status_code=400)
-            return await self.file.get_file_stat(path)
-        if action == "download_folder":
-            path = params.get("path")
-            if not path: return json_message("Missing path", status_code=400)
-            return await self.file.download_folder(path)
-        if action == "get_settings":
-            return json_response(self.data.get("settings", {}))
-        if action == "get_version":
-            from homeassistant.const import __version__ as ha_version_const
-            integration_version = "Unknown"
-            try:
-                def get_manifest_version():
-                    manifest_path = Path(__file__).parent / "manifest.json"
-                    import json
-                    with open(manifest_path, "r") as f:
-                        manifest = json.load(f)
-                        return manifest.get("version", "Unknown")
-                
-                integration_version = await hass.async_add_executor_job(get_manifest_version)
-            except: pass
-            
-            return json_response({
-                "ha_version": ha_version_const,
-                "integration_version": integration_version
-            })
-        
-        return json_message("Unknown action", status_code=400)
+
+        handler = self._get_actions.get(action)
+        if handler is None: return json_message("Unknown action", status_code=400)
+
+        response = await handler(params)
+        if action in ETAG_ACTIONS and response.status == 200:
+            return etag_response(request, response)
+        return response
 
     async def post(self, request: web.Request) -> web.Response:
         """Handle POST requests."""
         user = await self._authenticate(request)
         if not user:
             return web.Response(status=401, text="Unauthorized")
+        # The view stays registered while its config entry is unloaded
+        if self._executor is None: return json_message("CodeMirror is not loaded", status_code=503)
+
+        # Archives are uploaded as multipart forms so they can be streamed
+        if request.content_type == "multipart/form-data":
+            return await self._post_form(request)
+
+        # orjson parses the raw body, without decoding it to a str first
+        try: data = orjson.loads(await request.read())
+        except ValueError: return json_message("Invalid JSON", status_code=400)
 
-        try: data = await request.json()
-        except: return json_message("Invalid JSON", status_code=400)
-        
         action = data.get("action")
         if not action: return json_message("Missing action", status_code=400)
+
+        handler = self._post_actions.get(action)
+        if handler is None: return json_message("Unknown action", status_code=400)
+
+        return await handler(data)
+
+    # GET actions
+
+    async def _get_list_files(self, params) -> web.Response:
+        show_hidden = _qbool(params, "show_hidden")
+        files = await self._run_in_executor(self.file.list_files, show_hidden)
+        return json_response(files)
+
+    async def _get_list_directory(self, params) -> web.Response:
+        path = params.get("path", "")  # Empty string = root
+        show_hidden = _qbool(params, "show_hidden")
+        body = await self._run_in_executor(self.file.list_directory_body, path, show_hidden)
+        return json_body_response(body)
+
+    async def _get_read_file(self, params) -> web.Response:
+        path = params.get("path")
+        if not path: return json_message("Missing path", status_code=400)
+        return await self.file.read_file(path)
+
+    async def _get_serve_file(self, params) -> web.StreamResponse:
+        path = params.get("path")
+        if not path: return web.Response(status=400, text="Missing path")
+        return await self.file.serve_file(path)
+
+    async def _get_global_search(self, params) -> web.Response:
+        results = await self._global_search(
+            params.get("query"), 
+            _qbool(params, "case_sensitive"), 
+            _qbool(params, "use_regex"),
+            _qbool(params, "match_word"),
+            params.get("include", ""),
+            params.get("exclude", "")
+        )
+        return json_response(results)
+
+    async def _get_get_file_stat(self, params) -> web.Response:
+        path = params.get("path")
+        if not path: return json_message("Missing path", status_code=400)
+        return await self.file.get_file_stat(path)
+
+    async def _get_download_folder(self, params) -> web.Response:
+        path = params.get("path")
+        if not path: return json_message("Missing path", status_code=400)
+        return await self.file.download_folder(path)
+
+    async def _get_get_settings(self, params) -> web.Response:
+        return json_response(self.data.get("settings", {}))
+
+    async def _get_get_version(self, params) -> web.Response:
+        # The manifest does not change while the integration is loaded, read it once
+        if self._integration_version is None:
+            try:
+                def get_manifest_version():
+                    manifest_path = Path(__file__).parent / "manifest.json"
+                    manifest = orjson.loads(manifest_path.read_bytes())
+                    return manifest.get("version", "Unknown")
+                
+                self._integration_version = await self._run_in_executor(get_manifest_version)
+            except (OSError, ValueError) as err:
+                _LOGGER.warning("Failed to read integration version: %s", err)
         
-        hass = request.app["hass"]
-        self._update_hass(hass)
-
-        # Settings
-        if action == "save_settings":
-            self.data["settings"] = data.get("settings", {})
-            await self.store.async_save(self.data)
-            return json_response({"success": True})
-
-        # Files
-        if action == "write_file":
-            path = data.get("path")
-            content = data.get("content")
-            response = await self.file.write_file(path, content)
-            
-            # Auto-reload logic
-            if path and "/" not in path: # Only root files
-                if path == "automations.yaml":
-                    await hass.services.async_call("automation", "reload")
-                elif path == "scripts.yaml":
-                    await hass.services.async_call("script", "reload")
-                elif path == "scenes.yaml":
-                    await hass.services.async_call("scene", "reload")
-                elif path == "groups.yaml":
-                    await hass.services.async_call("group", "reload")
-            
-            return response
-
-        if action == "create_file": return await self.file.create_file(data.get("path"), data.get("content", ""), data.get("is_base64", False))
-        if action == "create_folder": return await self.file.create_folder(data.get("path"))
-        if action == "delete": return await self.file.delete(data.get("path"))
-        if action == "copy": return await self.file.copy(data.get("source"), data.get("destination"))
-        if action == "rename": return await self.file.rename(data.get("source"), data.get("destination"))
-        if action == "upload_file": return await self.file.upload_file(data.get("path"), data.get("content"), data.get("overwrite", False), data.get("is_base64", False))
-        if action == "upload_folder": return await self.file.upload_folder(data.get("path"), data.get("zip_data"))
-        if action == "download_multi": return await self.file.download_multi(data.get("paths", []))
-        if action == "delete_multi": return await self.file.delete_multi(data.get("paths", []))
-        if action == "move_multi": return await self.file.move_multi(data.get("paths", []), data.get("destination"))
-        if action == "check_yaml":
-            result = await hass.async_add_executor_job(self.syntax_checker.check_yaml, data.get("content", ""))
-            return result
-        if action == "check_jinja":
-            result = await hass.async_add_executor_job(self.syntax_checker.check_jinja, data.get("content", ""))
-            return result
-
-        # Misc
-        if action == "restart_home_assistant":
-            await hass.services.async_call("homeassistant", "restart")
-            return json_response({"success": True, "message": "Restarting..."})
-        if action == "get_entities":
-            query = data.get("query", "").lower()
-            entities = []
-            for s in hass.states.async_all():
-                eid = s.entity_id.lower()
-                fname = str(s.attributes.get("friendly_name", "")).lower()
-                if not query or query in eid or query in fname:
-                    entities.append({
-                        "entity_id": s.entity_id,
-                        "friendly_name": s.attributes.get("friendly_name"), 
-                        "icon": s.attributes.get("icon"),
-                        "state": s.state
-                    })
-            # Limit results to avoid massive payloads if query is empty/broad
-            return json_response({"entities": entities[:1000]})
-        if action == "global_search":
-            results = await hass.async_add_executor_job(
-                self.file.global_search, 
-                data.get("query"), 
-                data.get("case_sensitive", False), 
-                data.get("use_regex", False),
-                data.get("match_word", False),
-                data.get("include", ""),
-                data.get("exclude", "")
-            )
-            return json_response(results)
-        if action == "global_replace":
-            results = await hass.async_add_executor_job(
-                self.file.global_replace,
-                data.get("query"),
-                data.get("replacement"),
-                data.get("case_sensitive", False),
-                data.get("use_regex", False),
-                data.get("match_word", False),
-                data.get("include", ""),
-                data.get("exclude", "")
-            )
-            return json_response(results)
-
-        return json_message("Unknown action", status_code=400)
+        return json_response({
+            "ha_version": HA_VERSION,
+            "integration_version": self._integration_version or "Unknown"
+        })
+
+    async def _post_form(self, request: web.Request) -> web.Response:
+        """Handle multipart POST requests, fields are expected before the file."""
+        fields = {}
+        reader = await request.multipart()
+        while (part := await reader.next()) is not None:
+            if part.name != "file":
+                fields[part.name] = await part.text()
+                continue
+            action = fields.get("action")
+            if action == "upload_file":
+                return await self.file.upload_file_part(fields.get("path"), part, fields.get("overwrite") == "true")
+            if action == "upload_folder":
+                return await self.file.upload_folder(fields.get("path"), part)
+            return json_message("Unknown action", status_code=400)
+        return json_message("Missing file", status_code=400)
+
+    # POST actions
+
+    async def _post_save_settings(self, data: dict) -> web.Response:
+        self.data["settings"] = data.get("settings", {})
+        await self.store.async_save(self.data)
+        return json_response({"success": True})
+
+    async def _post_write_file(self, data: dict) -> web.Response:
+        path = data.get("path")
+        content = data.get("content")
+        response = await self.file.write_file(path, content)
+        
+        # Auto-reload logic, restarting the delay on each save
+        if path in self._reload_on_save:
+            if handle := self._reload_handles.get(path):
+                handle.cancel()
+            self._reload_handles[path] = self.hass.loop.call_later(RELOAD_DELAY, self._async_reload, path)
+        
+        return response
+
+    @callback
+    def _async_reload(self, path: str) -> None:
+        """Reload the domain of a saved file once its saves have settled."""
+        del self._reload_handles[path]
+        self.hass.async_create_task(self._reload_on_save[path]())
+
+    async def _post_create_file(self, data: dict) -> web.Response:
+        return await self.file.create_file(data.get("path"), data.get("content", ""), data.get("is_base64", False))
+
+    async def _post_create_folder(self, data: dict) -> web.Response:
+        return await self.file.create_folder(data.get("path"))
+
+    async def _post_delete(self, data: dict) -> web.Response:
+        return await self.file.delete(data.get("path"))
+
+    async def _post_copy(self, data: dict) -> web.Response:
+        return await self.file.copy(data.get("source"), data.get("destination"))
+
+    async def _post_rename(self, data: dict) -> web.Response:
+        return await self.file.rename(data.get("source"), data.get("destination"))
+
+    async def _post_upload_file(self, data: dict) -> web.Response:
+        return await self.file.upload_file(data.get("path"), data.get("content"), data.get("overwrite", False), data.get("is_base64", False))
+
+    async def _post_download_multi(self, data: dict) -> web.Response:
+        return await self.file.download_multi(data.get("paths", []))
+
+    async def _post_delete_multi(self, data: dict) -> web.Response:
+        return await self.file.delete_multi(data.get("paths", []))
+
+    async def _post_move_multi(self, data: dict) -> web.Response:
+        return await self.file.move_multi(data.get("paths", []), data.get("destination"))
+
+    async def _post_check_yaml(self, data: dict) -> web.Response:
+        content = data.get("content", "")
+        body = await self._run_coalesced(("check_yaml", content), self.syntax_checker.check_yaml_body, content)
+        return json_body_response(body)
+
+    async def _post_check_jinja(self, data: dict) -> web.Response:
+        content = data.get("content", "")
+        body = await self._run_coalesced(("check_jinja", content), self.syntax_checker.check_jinja_body, content)
+        return json_body_response(body)
+
+    async def _post_restart_home_assistant(self, data: dict) -> web.Response:
+        await self.hass.services.async_call("homeassistant", "restart")
+        return json_response({"success": True, "message": "Restarting..."})
+
+    def _get_entity_index(self) -> tuple[str, list[int], list[str]]:
+        """Return the casefolded entity records joined in one string, where each starts, and the entity ids.
+
+        A record is the entity id and friendly name separated by ENTITY_FIELD_SEP,
+        records are separated by ENTITY_RECORD_SEP.
+        """
+        if self._entity_index is None:
+            states = self.hass.states.async_all()
+            records = [
+                f"{s.entity_id}{ENTITY_FIELD_SEP}{s.attributes.get('friendly_name', '')}".casefold()
+                for s in states
+            ]
+            starts = list(accumulate((len(r) + 1 for r in records[:-1]), initial=0))
+            self._entity_index = (ENTITY_RECORD_SEP.join(records), starts, [s.entity_id for s in states])
+        return self._entity_index
+
+    def _iter_entity_matches(self, query: str) -> Iterator[str]:
+        """Yield the ids of the entities whose id or friendly name contains query.
+
+        The joined records are scanned with str.find, which skips the entities
+        that do not match without looking at them one by one.
+        """
+        if ENTITY_FIELD_SEP in query or ENTITY_RECORD_SEP in query:
+            return
+        haystack, starts, entity_ids = self._get_entity_index()
+        last = len(starts) - 1
+        pos = haystack.find(query)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            yield entity_ids[i]
+            if i == last:
+                return
+            # One result per entity, resume at the next record
+            pos = haystack.find(query, starts[i + 1])
+
+    async def _post_get_entities(self, data: dict) -> web.Response:
+        query = data.get("query", "").casefold()
+        if query:
+            # The index outlives state updates, so matches get their current state
+            matches = filter(None, map(self.hass.states.get, self._iter_entity_matches(query)))
+        else:
+            # Everything matches, no need for the casefolded index
+            matches = self.hass.states.async_all()
+        # Limit results to avoid massive payloads if query is empty/broad, the
+        # scan stops as soon as the limit is reached
+        entities = [
+            {
+                "entity_id": s.entity_id,
+                "friendly_name": s.attributes.get("friendly_name"), 
+                "icon": s.attributes.get("icon"),
+                "state": s.state
+            }
+            for s in islice(matches, MAX_ENTITIES)
+        ]
+        return json_response({"entities": entities})
+
+    async def _post_global_search(self, data: dict) -> web.Response:
+        results = await self._global_search(
+            data.get("query"), 
+            data.get("case_sensitive", False), 
+            data.get("use_regex", False),
+            data.get("match_word", False),
+            data.get("include", ""),
+            data.get("exclude", "")
+        )
+        return json_response(results)
+
+    async def _post_global_replace(self, data: dict) -> web.Response:
+        # A change to the files, run in Home Assistant's executor like the other writes
+        results = await self.hass.async_add_executor_job(
+            self.file.global_replace,
+            data.get("query"),
+            data.get("replacement"),
+            data.get("case_sensitive", False),
+            data.get("use_regex", False),
+            data.get("match_word", False),
+            data.get("include", ""),
+            data.get("exclude", "")
+        )
+        return json_response(results)
@@ -5,7 +5,7 @@ NAME = "CodeMirror"
 VERSION = "1.0.0"
 
 # File extensions allowed for editing
-ALLOWED_EXTENSIONS = {
+ALLOWED_EXTENSIONS = frozenset({
     ".yaml", ".yml", ".json", ".py", ".js", ".css", ".html", ".txt", ".csv",
     ".md", ".conf", ".cfg", ".ini", ".sh", ".log", ".gitignore", ".jinja", ".jinja2", ".j2",
     ".db", ".sqlite",
@@ -14,36 +14,42 @@ ALLOWED_EXTENSIONS = {
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp", ".ico",
     ".pdf", ".zip",
     ".mp4", ".webm", ".mov", ".avi", ".mkv", ".flv", ".wmv", ".m4v",
-}
+})
 
 # Binary file extensions that should be base64 encoded
-BINARY_EXTENSIONS = {
+BINARY_EXTENSIONS = frozenset({
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".ico", ".pdf", ".zip",
     ".db", ".sqlite",
     ".der", ".bin", ".ota", ".tar", ".gz",
     ".mp4", ".webm", ".mov", ".avi", ".mkv", ".flv", ".wmv", ".m4v",
-}
+})
+
+# File extensions of already compressed formats, stored in archives as is
+COMPRESSED_EXTENSIONS = frozenset({
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".zip", ".gz",
+    ".mp4", ".webm", ".mov", ".mkv", ".flv", ".wmv", ".m4v",
+})
 
 # Specific filenames allowed even if they don't have an extension
-ALLOWED_FILENAMES = {
+ALLOWED_FILENAMES = frozenset({
     ".gitignore",
     ".ha_run.lock"
-}
+})
 
 # Directories/patterns to exclude
-EXCLUDED_PATTERNS = {
+EXCLUDED_PATTERNS = frozenset({
     "__pycache__",
     ".git",
     ".cache",
     "deps",
     "tts",
     ".git_credential_helper",
-}
+})
 
 # Protected paths that cannot be deleted
-PROTECTED_PATHS = {
+PROTECTED_PATHS = frozenset({
     "configuration.yaml",
     "secrets.yaml",
     "home-assistant.log",
     ".storage",
-}
+})
@@ -1,40 +1,399 @@
 """File management for CodeMirror."""
 from __future__ import annotations
 
+import asyncio
 import base64
+import concurrent.futures
+import errno
+import fnmatch
 import io
 import logging
+import mmap
 import os
+import re
 import shutil
+import stat
 import zipfile
 import mimetypes
+import tempfile
 import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, TypeVar
 
-from aiohttp import web
+from aiohttp import BodyPartReader, web
 from homeassistant.core import HomeAssistant
 
 from .const import (
     ALLOWED_EXTENSIONS, BINARY_EXTENSIONS, ALLOWED_FILENAMES,
-    EXCLUDED_PATTERNS, PROTECTED_PATHS
+    COMPRESSED_EXTENSIONS, EXCLUDED_PATTERNS, PROTECTED_PATHS
 )
-from .util import json_response, json_message, get_safe_path
+from .util import json_bytes, json_response, json_message, get_safe_path
 
 _LOGGER = logging.getLogger(__name__)
 
+# Load the MIME types database now rather than on the first file served
+if not mimetypes.inited:
+    mimetypes.init()
+
+_T = TypeVar("_T")
+
+# Size of the chunks archives and uploads are streamed from and to the client in
+ZIP_CHUNK_SIZE = 64 * 1024
+# zlib level archives are deflated at, below the default of 6, which takes
+# over twice as long on text files for archives only slightly smaller
+ZIP_COMPRESS_LEVEL = 3
+# Size of the chunks served files are read in when sendfile is not available
+SERVE_CHUNK_SIZE = 256 * 1024
+# Uploads up to this size are kept in memory, larger ones on disk
+UPLOAD_SPOOL_SIZE = 16 * 1024 * 1024
+
+# Number of entries at the top of a tree from which it is considered large,
+# and its directories scanned concurrently when listing it
+PARALLEL_WALK_THRESHOLD = 64
+
+# Seconds updates are gathered for before being fired as a single event, so
+# a burst of operations does not make the client refresh once per operation
+UPDATE_EVENT_DELAY = 0.1
+
+# Threads reading files concurrently during a global search or replace, the
+# reads mostly wait on I/O so there are a few per core
+SEARCH_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Size from which a searched file is memory mapped and scanned as a whole
+# rather than decoded and searched line by line
+MMAP_SEARCH_THRESHOLD = 8 * 1024
+
+# Carriage return not followed by a line feed, which ends a line when read
+# with universal newlines but not when splitting on line feeds
+_LONE_CR = re.compile(rb"\r(?!\n)")
+
+# Largest file read_file sends inline in its JSON response, larger files are
+# answered without their content and fetched raw with serve_file instead
+MAX_INLINE_READ_SIZE = 10 * 1024 * 1024
+# Size of the chunks binary files are base64 encoded in, a multiple of 3
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
+def _suffix(name: str) -> str:
+    """Return the lowercased suffix of a file name, as Path.suffix finds it."""
+    i = name.rfind(".")
+    return name[i:].lower() if 0 < i < len(name) - 1 else ""
+
+
+@lru_cache(maxsize=4096)
+def _is_name_allowed(name: str) -> bool:
+    """Check if a file name has an allowed extension or is allowed as is.
+
+    Cached by name, as listings and searches keep checking the same files.
+    """
+    return _suffix(name) in ALLOWED_EXTENSIONS or name in ALLOWED_FILENAMES
+
+
+@lru_cache(maxsize=64)
+def _glob_matchers(patterns: str) -> tuple[Callable[[str], re.Match | None], ...]:
+    """Compile comma separated glob patterns, as fnmatch reads them, to match functions.
+
+    Cached by pattern string, as the panel repeats the same filters while typing.
+    """
+    return tuple(re.compile(fnmatch.translate(p)).match for p in map(str.strip, patterns.split(",")) if p)
+
+
+@lru_cache(maxsize=64)
+def _search_pattern(query: str, case_sensitive: bool, use_regex: bool, match_word: bool) -> re.Pattern[str]:
+    """Compile the pattern a search or replace looks for, cached like _glob_matchers."""
+    search_pattern = query if use_regex else re.escape(query)
+    if match_word:
+        search_pattern = rf"\b{search_pattern}\b"
+    return re.compile(search_pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _guess_type_for_suffixes(suffixes: str) -> str | None:
+    """Guess the MIME type of any file name ending with the given suffixes."""
+    return mimetypes.guess_type("x" + suffixes)[0]
+
+
+def _guess_mime_type(name: str) -> str | None:
+    """Guess the MIME type of a file name like mimetypes.guess_type, cached by its suffixes."""
+    i = name.find(".", 1)
+    return _guess_type_for_suffixes(name[i:] if i > 0 else "")
+
+
+def _zip_compress_type(name: str) -> int | None:
+    """Compression of a file in an archive, stored if already compressed, else the archive's."""
+    return zipfile.ZIP_STORED if _suffix(name) in COMPRESSED_EXTENSIONS else None
+
+
+def _dir_entry_sort_key(entry: os.DirEntry) -> tuple[bool, str]:
+    """Sort key listing folders first, then by case-insensitive name."""
+    try:
+        is_dir = entry.is_dir()
+    except OSError:
+        is_dir = False
+    return not is_dir, entry.name.lower()
+
+
+def _scan_dir(dirpath: str, show_hidden: bool = False, mtimes: dict[str, int | None] | None = None) -> tuple[list[os.DirEntry], list[os.DirEntry]] | None:
+    """Split a directory into the subdirectories to walk and its files, None if unreadable.
+
+    With mtimes given, the directory's mtime is recorded in it before the scan,
+    so a change made while scanning is seen as one later, or None if it cannot
+    be scanned.
+    """
+    if mtimes is not None:
+        try:
+            mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            mtimes[dirpath] = None
+    dirs = []
+    files = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry)
+                elif (show_hidden or entry.name[:1] != ".") and entry.name not in EXCLUDED_PATTERNS:
+                    dirs.append(entry)
+    except OSError:
+        if mtimes is not None:
+            mtimes[dirpath] = None
+        return None
+    return dirs, files
+
+
+def _scandir_walk(top: str | Path, show_hidden: bool = False, mtimes: dict[str, int | None] | None = None) -> Iterator[tuple[str, list[os.DirEntry], list[os.DirEntry]]]:
+    """Walk a tree top-down like os.walk, yielding DirEntry objects.
+
+    Excluded directories, and hidden ones unless show_hidden is set, are
+    neither yielded nor descended into. Symlinked directories are listed but not
+    followed. Unreadable directories are skipped. The mtimes of the walked
+    directories are recorded in mtimes when given, as _scan_dir does.
+    """
+    stack = [os.fspath(top)]
+    while stack:
+        dirpath = stack.pop()
+        scanned = _scan_dir(dirpath, show_hidden, mtimes)
+        if scanned is None:
+            continue
+        dirs, files = scanned
+        yield dirpath, dirs, files
+        stack.extend(reversed([entry.path for entry in dirs if not entry.is_symlink()]))
+
+
+def _parallel_scandir_walk(tops: list[str], executor: Executor, show_hidden: bool = False, mtimes: dict[str, int | None] | None = None) -> Iterator[tuple[str, list[os.DirEntry], list[os.DirEntry]]]:
+    """Walk trees like _scandir_walk, scanning the directories of each level concurrently in executor.
+
+    Directories are yielded level by level instead of depth first.
+    """
+    level = tops
+    while level:
+        next_level = []
+        for dirpath, scanned in zip(level, executor.map(_scan_dir, level, repeat(show_hidden), repeat(mtimes))):
+            if scanned is None:
+                continue
+            dirs, files = scanned
+            yield dirpath, dirs, files
+            next_level.extend(entry.path for entry in dirs if not entry.is_symlink())
+        level = next_level
+
+
+def _dir_mtimes_changed(mtimes: dict[str, int | None]) -> bool:
+    """Check if any directory was modified or removed since its mtime was recorded.
+
+    Directories recorded as unreadable count as changed once they can be read,
+    which a chmod does without touching their mtime.
+    """
+    for dir_path, mtime in mtimes.items():
+        if mtime is None:
+            if os.access(dir_path, os.R_OK | os.X_OK): return True
+            continue
+        try:
+            if os.stat(dir_path).st_mtime_ns != mtime: return True
+        except OSError:
+            return True
+    return False
+
+
+def _open_regular_file(path: str | Path) -> tuple[int, os.stat_result]:
+    """Open a file for reading, along with the stat of the opened file.
+
+    Raises FileNotFoundError for anything but a regular file, which is only
+    told apart once opened. Opening does not block on a FIFO.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise FileNotFoundError(errno.ENOENT, "Not a regular file", os.fspath(path))
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd, st
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Read a file descriptor to its end, given the size of the file."""
+    # Asking for one byte more than the size gets the whole file and hits
+    # its end in one read, unless it changed size since the stat
+    chunks = [os.read(fd, size + 1)]
+    if len(chunks[0]) != size:
+        while chunk := os.read(fd, 64 * 1024):
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _read_file_content(path: str | Path, binary: bool) -> tuple[str | None, os.stat_result]:
+    """Read a file as sent to the editor, base64 encoded if binary.
+
+    The content is None if the file is larger than MAX_INLINE_READ_SIZE.
+    """
+    fd, st = _open_regular_file(path)
+    try:
+        if st.st_size > MAX_INLINE_READ_SIZE:
+            return None, st
+        if not binary:
+            return _decode_text(_read_fd(fd, st.st_size)), st
+        # Encoding a chunk at a time never holds the raw file and its encoding
+        # at once, chunks being a multiple of 3 bytes so they encode without padding
+        chunks = []
+        with open(fd, "rb", closefd=False) as file:
+            while chunk := file.read(BASE64_CHUNK_SIZE):
+                chunks.append(base64.b64encode(chunk).decode("ascii"))
+        return "".join(chunks), st
+    finally:
+        os.close(fd)
+
+
+def _stat_file(path: str | Path) -> os.stat_result:
+    """Stat a file, raising FileNotFoundError for anything but a regular file."""
+    st = os.stat(path)
+    if not stat.S_ISREG(st.st_mode):
+        raise FileNotFoundError(errno.ENOENT, "Not a regular file", os.fspath(path))
+    return st
+
+
+def _write_fd(fd: int, data: bytes | IO[bytes]) -> None:
+    """Write all of data, bytes or a file read from its current position, to a file descriptor."""
+    if not isinstance(data, bytes):
+        while chunk := data.read(ZIP_CHUNK_SIZE):
+            _write_fd(fd, chunk)
+        return
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_file(path: str | Path, data: bytes | IO[bytes], exclusive: bool = False) -> os.stat_result:
+    """Write a whole file and return its stat once written.
+
+    The file is created or truncated, or with exclusive set, created only if
+    nothing exists at path, raising FileExistsError otherwise.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+    fd = os.open(path, flags, 0o666)
+    try:
+        _write_fd(fd, data)
+        return os.fstat(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace_file(path: str | Path, data: bytes | IO[bytes]) -> os.stat_result:
+    """Replace the content of a file atomically and return its stat once written.
+
+    The data is written and synced to a temporary file next to it, given the
+    file's mode and owner, then renamed over it, so a crash never leaves a
+    truncated file behind. Files that do not exist yet are simply written.
+    A symlink is followed so the file it points to is replaced, not the link.
+    """
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return _write_file(path, data)
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        try:
+            _write_fd(fd, data)
+            os.fchmod(fd, stat.S_IMODE(st.st_mode))
+            if (st.st_uid, st.st_gid) != (os.getuid(), os.getgid()):
+                try:
+                    os.fchown(fd, st.st_uid, st.st_gid)
+                except PermissionError:
+                    pass
+            os.fsync(fd)
+            new_st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return new_st
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 file content with universal newlines, as Path.read_text does."""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 class FileManager:
     """Class to handle file operations."""
 
-    def __init__(self, hass: HomeAssistant, config_dir: Path) -> None:
+    def __init__(self, hass: HomeAssistant, config_dir: Path, executor: Executor | None = None) -> None:
         """Initialize file manager.
 
         Args:
             hass: Home Assistant instance
             config_dir: Base configuration directory
+            executor: Executor running blocking file operations, defaults to
+                the loop's default executor
         """
         self.hass = hass
         self.config_dir = config_dir
+        self._executor = executor
+        self._search_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=SEARCH_WORKERS, thread_name_prefix="code_mirror_search"
+        )
+        # Last recursive listing per show_hidden, with the mtimes of the
+        # directories it was built from
+        self._listing_cache: dict[bool, tuple[dict[str, int | None], list[dict]]] = {}
+        # Updates waiting to be fired as one event, and the timer firing them
+        self._pending_updates: list[tuple[str, str | None]] = []
+        self._flush_updates_handle: asyncio.TimerHandle | None = None
+
+    def _run_in_executor(self, func: Callable[..., _T], *args: Any) -> asyncio.Future[_T]:
+        """Run a blocking read in the file operations executor.
+
+        Reads, walks, searches and streamed downloads run in the integration
+        pool. Every change to the files a user makes (saves, creations,
+        uploads, deletions, copies, moves and renames) goes through
+        _run_write instead, so it never waits behind them.
+        """
+        return self.hass.loop.run_in_executor(self._executor, func, *args)
+
+    def _run_write(self, func: Callable[..., _T], *args: Any) -> asyncio.Future[_T]:
+        """Run a blocking change to the files in Home Assistant's executor."""
+        return self.hass.async_add_executor_job(func, *args)
+
+    def shutdown(self) -> None:
+        """Stop the search pool, cancelling the file reads not started yet."""
+        self._search_executor.shutdown(wait=False, cancel_futures=True)
 
     def _get_root_dir(self) -> Path:
         """Get the root directory (always config_dir).
@@ -51,46 +410,121 @@ class FileManager:
                 return True
         except ValueError:
             pass
-        return (path.suffix.lower() in ALLOWED_EXTENSIONS or path.name in ALLOWED_FILENAMES)
+        return _is_name_allowed(path.name)
+
+    def _is_rel_path_allowed(self, rel_path: str, name: str) -> bool:
+        """Check if a file given by its path relative to the root is allowed."""
+        # The substring test saves splitting the path in the common case
+        if ".storage" in rel_path and ".storage" in rel_path.split(os.sep):
+            return True
+        return _is_name_allowed(name)
 
     def _is_protected(self, path: str) -> bool:
         """Check if path is protected."""
-        parts = path.strip("/").split("/")
-        return parts[0] in PROTECTED_PATHS or path.strip("/") in PROTECTED_PATHS
+        # Protected paths are all top level names, so only the first part matters
+        return path.strip("/").partition("/")[0] in PROTECTED_PATHS
+
+    def _resolve_targets(self, paths: list[str]) -> list[tuple[str, Path, bool]]:
+        """Resolve the unprotected paths of a bulk operation that exist.
+
+        Returns the path, its resolved path and whether it is a directory, from
+        a single stat each.
+        """
+        root_dir = self._get_root_dir()
+        targets = []
+        for path in paths:
+            if self._is_protected(path): continue
+            safe_path = get_safe_path(root_dir, path)
+            if not safe_path or safe_path == root_dir: continue
+            try:
+                mode = os.stat(safe_path).st_mode
+            except OSError:
+                continue
+            targets.append((path, safe_path, stat.S_ISDIR(mode)))
+        return targets
 
     def _get_dir_size(self, path: Path) -> int:
         """Get directory size."""
         total = 0
-        try:
-            for entry in os.scandir(path):
-                if entry.is_file(): total += entry.stat().st_size
-                elif entry.is_dir(): total += self._get_dir_size(Path(entry.path))
-        except (OSError, PermissionError): pass
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_file(): total += entry.stat().st_size
+                        elif entry.is_dir(): stack.append(entry.path)
+            except OSError: pass
         return total
 
     def _fire_update(self, action: str, path: str | None = None):
-        """Fire a websocket update event."""
+        """Fire a websocket update event, batching the updates made within UPDATE_EVENT_DELAY."""
 
         if self.hass:
-            self.hass.bus.async_fire("code_mirror_update", {
-                "action": action,
-                "path": path,
-                "timestamp": time.time()
-            })
+            self._pending_updates.append((action, path))
+            if self._flush_updates_handle is None:
+                self._flush_updates_handle = self.hass.loop.call_later(UPDATE_EVENT_DELAY, self._flush_updates)
+
+    def _flush_updates(self) -> None:
+        """Fire a single websocket update event for the pending updates."""
+        updates, self._pending_updates = self._pending_updates, []
+        self._flush_updates_handle = None
+        # Anything but a write changes the tree, so a batch is told as its first
+        # such update, with every action of the batch in "actions" for the
+        # client to decide from all of them whether to reload the tree
+        action, path = next((update for update in updates if update[0] != "write"), updates[-1])
+        if any(update[1] != path for update in updates):
+            path = None
+        self.hass.bus.async_fire("code_mirror_update", {
+            "action": action,
+            "actions": list(dict.fromkeys(update[0] for update in updates)),
+            "path": path,
+            "timestamp": time.time()
+        })
+
+    def _walk_for_listing(self, root_dir: Path, show_hidden: bool, mtimes: dict[str, int | None]) -> Iterator[tuple[str, list[os.DirEntry], list[os.DirEntry]]]:
+        """Walk a tree to list it, scanning directories concurrently when it is large.
+
+        Whether it is large is told by the scan of its top, which the walk then
+        carries on from, in the search pool when scanning concurrently.
+        """
+        top = os.fspath(root_dir)
+        scanned = _scan_dir(top, show_hidden, mtimes)
+        if scanned is None:
+            return
+        dirs, files = scanned
+        yield top, dirs, files
+        subdirs = [entry.path for entry in dirs if not entry.is_symlink()]
+        if len(dirs) + len(files) > PARALLEL_WALK_THRESHOLD:
+            yield from _parallel_scandir_walk(subdirs, self._search_executor, show_hidden, mtimes)
+        else:
+            for subdir in subdirs:
+                yield from _scandir_walk(subdir, show_hidden, mtimes)
 
     def list_files(self, show_hidden: bool = False) -> list[dict]:
-        """List files recursively."""
+        """List files recursively.
+
+        The listing only depends on the entries of the walked directories, so
+        it is reused until one of them is modified, which a stat per directory
+        tells without scanning them. Their mtimes are taken as they are scanned.
+        """
+        cached = self._listing_cache.get(show_hidden)
+        if cached is not None and not _dir_mtimes_changed(cached[0]):
+            return cached[1]
+
         res = []
+        mtimes: dict[str, int | None] = {}
         root_dir = self._get_root_dir()
-        for root, dirs, files in os.walk(root_dir):
-            if not show_hidden: dirs[:] = [d for d in dirs if d not in EXCLUDED_PATTERNS and not d.startswith(".")]
-            else: dirs[:] = [d for d in dirs if d not in EXCLUDED_PATTERNS]
-            rel_root = Path(root).relative_to(root_dir)
-            for name in sorted(files):
-                file_path = Path(root) / name
-                if (not show_hidden and name.startswith(".")) or not self._is_file_allowed(file_path): continue
-                res.append({"path": str(rel_root / name if str(rel_root) != "." else name), "name": name, "type": "file"})
-        return sorted(res, key=lambda x: x["path"])
+        # Relative paths are sliced off the entry paths, which all start with the root
+        root_prefix = len(os.path.join(root_dir, ""))
+        for root, dirs, files in self._walk_for_listing(root_dir, show_hidden, mtimes):
+            for entry in files:
+                name = entry.name
+                rel_path = entry.path[root_prefix:]
+                if (not show_hidden and name.startswith(".")) or not self._is_rel_path_allowed(rel_path, name): continue
+                res.append({"path": rel_path, "name": name, "type": "file"})
+        res.sort(key=itemgetter("path"))
+        self._listing_cache[show_hidden] = (mtimes, res)
+        return res
 
     def list_directory(self, path: str = "", show_hidden: bool = False) -> dict:
         """
@@ -131,30 +565,28 @@ class FileManager:
             folders = []
             files = []
 
-            # Standard exclusions only
-            all_exclusions = EXCLUDED_PATTERNS
-
-            # List directory contents (NON-RECURSIVE - just immediate children)
-            for item in sorted(target_path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
+            # Everything under .storage is listed, whatever its extension
+            try:
+                in_storage = ".storage" in target_path.relative_to(root_dir).parts
+            except ValueError:
+                in_storage = False
+
+            # List directory contents (NON-RECURSIVE - just immediate children),
+            # dropping hidden and excluded entries before sorting what is left.
+            # DirEntry caches the file type so sorting does not stat every entry
+            with os.scandir(target_path) as it:
+                entries = [
+                    item for item in it
+                    if (show_hidden or item.name[:1] != ".") and item.name not in EXCLUDED_PATTERNS
+                ]
+            entries.sort(key=_dir_entry_sort_key)
+            # Prefix of the relative paths of the children
+            rel_prefix = f"{path.rstrip('/')}/" if path else ""
+            for item in entries:
                 item_name = item.name
 
-                # Skip hidden files if not showing hidden
-                if not show_hidden and item_name.startswith("."):
-                    continue
-
-                # Skip excluded patterns
-                if item_name in all_exclusions:
-                    continue
-
                 # Calculate relative path
-                try:
-                    if path:
-                        rel_path = f"{path}/{item_name}"
-                    else:
-                        # Root level - relative to root_dir
-                        rel_path = str(item.relative_to(root_dir))
-                except (ValueError, OSError):
-                    rel_path = item_name
+                rel_path = rel_prefix + item_name
 
                 try:
                     # Check if item is a symlink
@@ -163,25 +595,14 @@ class FileManager:
                     if is_symlink:
                         try:
                             # Get symlink target (relative or absolute)
-                            symlink_target = str(item.readlink())
-                        except (OSError, ValueError, AttributeError):
-                            try:
-                                import os
-                                symlink_target = os.readlink(str(item))
-                            except OSError:
-                                symlink_target = None
+                            symlink_target = os.readlink(item.path)
+                        except OSError:
+                            symlink_target = None
                     if item.is_dir():
-                        # Count immediate children for folder badge (fast)
-                        try:
-                            child_count = sum(1 for _ in item.iterdir())
-                        except (PermissionError, OSError):
-                            child_count = 0
-
                         folder_data = {
                             "name": item_name,
                             "path": rel_path,
-                            "size": 0,  # Don't calculate size for lazy loading (too slow)
-                            "childCount": child_count
+                            "size": 0  # Don't calculate size for lazy loading (too slow)
                         }
                         if is_symlink:
                             folder_data["isSymlink"] = True
@@ -190,7 +611,7 @@ class FileManager:
                         folders.append(folder_data)
                     elif item.is_file():
                         # Check if file is allowed (symlinks always shown regardless of extension)
-                        if is_symlink or self._is_file_allowed(item):
+                        if is_symlink or in_storage or item_name == ".storage" or _is_name_allowed(item_name):
                             try:
                                 size = item.stat().st_size
                             except (PermissionError, OSError):
@@ -235,49 +656,55 @@ class FileManager:
             _LOGGER.error("list_directory() failed for path '%s': %s", path, e)
             return {"path": path, "folders": [], "files": [], "error": str(e)}
 
+    def list_directory_body(self, path: str = "", show_hidden: bool = False) -> bytes:
+        """List a directory as a JSON body, serialized in the calling worker thread."""
+        return json_bytes(self.list_directory(path, show_hidden))
+
     def global_search(self, query: str, case_sensitive: bool = False, use_regex: bool = False, match_word: bool = False, include: str = "", exclude: str = "") -> list[dict]:
         """Perform global search across allowed config files."""
-        import re
-        import fnmatch
-        import concurrent.futures
-
         results = []
         try:
             # Prepare pattern
-            flags = 0 if case_sensitive else re.IGNORECASE
-            search_pattern = query
-            if not use_regex:
-                search_pattern = re.escape(query)
-            if match_word:
-                search_pattern = rf"\b{search_pattern}\b"
-            
-            pattern = re.compile(search_pattern, flags)
+            pattern = _search_pattern(query, case_sensitive, use_regex, match_word)
+            # A case sensitive printable ASCII literal finds at least the lines
+            # the text pattern does when matched against the raw bytes, so large
+            # files can be scanned without decoding them. Case insensitive ones
+            # cannot, the text pattern also matches Unicode case folds such as
+            # the Kelvin sign for "k"
+            byte_pattern = None
+            needle = None
+            if case_sensitive and not use_regex and query.isascii() and query.isprintable():
+                byte_pattern = re.compile(pattern.pattern.encode())
+                # Plain substrings are found faster with bytes.find
+                if not match_word:
+                    needle = query.encode()
 
             # Prepare include/exclude filters
-            include_patterns = [p.strip() for p in include.split(',') if p.strip()]
-            exclude_patterns = [p.strip() for p in exclude.split(',') if p.strip()]
+            include_matchers = _glob_matchers(include)
+            exclude_matchers = _glob_matchers(exclude)
 
             # Collect files first
             search_files = []
             root_dir = self._get_root_dir()
-            for root, dirs, files in os.walk(root_dir):
-                dirs[:] = [d for d in dirs if not d.startswith(".") and d not in EXCLUDED_PATTERNS]
-                for name in files:
-                    file_path = Path(root) / name
-                    rel_path = str(file_path.relative_to(root_dir))
+            root_prefix = len(os.path.join(root_dir, ""))
+            for root, dirs, files in _scandir_walk(root_dir):
+                for entry in files:
+                    name = entry.name
+                    file_path = entry.path
+                    rel_path = file_path[root_prefix:]
 
                     # 1. Filter allowed files
-                    if not self._is_file_allowed(file_path): continue
-                    if file_path.suffix.lower() in BINARY_EXTENSIONS: continue
+                    if not self._is_rel_path_allowed(rel_path, name): continue
+                    if _suffix(name) in BINARY_EXTENSIONS: continue
 
                     # 2. Filter Include
-                    if include_patterns:
-                        if not any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in include_patterns):
+                    if include_matchers:
+                        if not any(match(rel_path) or match(name) for match in include_matchers):
                             continue
                     
                     # 3. Filter Exclude
-                    if exclude_patterns:
-                        if any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in exclude_patterns):
+                    if exclude_matchers:
+                        if any(match(rel_path) or match(name) for match in exclude_matchers):
                             continue
                     
                     search_files.append((file_path, rel_path))
@@ -287,8 +714,18 @@ class FileManager:
                 f_path, r_path = args
                 local_results = []
                 try:
-                    with open(f_path, "r", encoding="utf-8", errors="ignore") as f:
-                        for i, line in enumerate(f):
+                    with open(f_path, "rb") as f:
+                        if byte_pattern is not None and os.fstat(f.fileno()).st_size > MMAP_SEARCH_THRESHOLD:
+                            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                                # Mapped files are split on line feeds, which only gives
+                                # the lines of the text path without lone carriage returns
+                                if not _LONE_CR.search(mm):
+                                    search_mapped_file(mm, r_path, local_results)
+                                    return local_results
+                        if needle is not None:
+                            if needle not in f.read(): return local_results
+                            f.seek(0)
+                        for i, line in enumerate(io.TextIOWrapper(f, encoding="utf-8", errors="ignore")):
                             if pattern.search(line):
                                 local_results.append({
                                     "path": r_path,
@@ -299,14 +736,46 @@ class FileManager:
                 except: pass
                 return local_results
 
-            # Execute in parallel
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                futures = [executor.submit(search_single_file, f) for f in search_files]
+            def search_mapped_file(mm, r_path, local_results):
+                line_num = 1
+                counted = 0
+                pos = 0
+                while True:
+                    if needle is not None:
+                        found = mm.find(needle, pos)
+                        if found < 0: break
+                    else:
+                        match = byte_pattern.search(mm, pos)
+                        if not match: break
+                        found = match.start()
+                    # Only the lines holding a match are decoded, and checked
+                    # against the text pattern
+                    start = mm.rfind(b"\n", 0, found) + 1
+                    end = mm.find(b"\n", found)
+                    if end < 0: end = len(mm)
+                    line_num += mm[counted:start].count(b"\n")
+                    counted = start
+                    line = mm[start:end].decode("utf-8", "ignore")
+                    if pattern.search(line):
+                        local_results.append({
+                            "path": r_path,
+                            "line": line_num,
+                            "content": line.strip()
+                        })
+                        if len(local_results) > 100: break # Limit matches per file
+                    pos = end + 1
+
+            # Execute in parallel, dropping the files not read yet once enough results are found
+            futures = [self._search_executor.submit(search_single_file, f) for f in search_files]
+            try:
                 for future in concurrent.futures.as_completed(futures):
                     res = future.result()
                     if res:
                         results.extend(res)
                         if len(results) >= 2000: break # Hard limit total results
+            finally:
+                for future in futures:
+                    future.cancel()
 
         except Exception as e:
             _LOGGER.error("Global search error: %s", e)
@@ -314,47 +783,36 @@ class FileManager:
 
     def global_replace(self, query: str, replacement: str, case_sensitive: bool = False, use_regex: bool = False, match_word: bool = False, include: str = "", exclude: str = "") -> dict:
         """Perform global find and replace across files."""
-        import re
-        import fnmatch
-        import concurrent.futures
-
         files_updated = 0
         occurrences = 0
         
         try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            search_pattern = query
-            if not use_regex:
-                search_pattern = re.escape(query)
-            if match_word:
-                search_pattern = rf"\b{search_pattern}\b"
-            
-            pattern = re.compile(search_pattern, flags)
+            pattern = _search_pattern(query, case_sensitive, use_regex, match_word)
 
-            include_patterns = [p.strip() for p in include.split(',') if p.strip()]
-            exclude_patterns = [p.strip() for p in exclude.split(',') if p.strip()]
+            include_matchers = _glob_matchers(include)
+            exclude_matchers = _glob_matchers(exclude)
 
             # Collect files
             target_files = []
             root_dir = self._get_root_dir()
-            for root, dirs, files in os.walk(root_dir):
-                dirs[:] = [d for d in dirs if not d.startswith(".") and d not in EXCLUDED_PATTERNS]
-                for name in files:
-                    file_path = Path(root) / name
-                    rel_path = str(file_path.relative_to(root_dir))
-
-                    if not self._is_file_allowed(file_path): continue
-                    if file_path.suffix.lower() in BINARY_EXTENSIONS: continue
+            root_prefix = len(os.path.join(root_dir, ""))
+            for root, dirs, files in _scandir_walk(root_dir):
+                for entry in files:
+                    name = entry.name
+                    rel_path = entry.path[root_prefix:]
+
+                    if not self._is_rel_path_allowed(rel_path, name): continue
+                    if _suffix(name) in BINARY_EXTENSIONS: continue
                     if rel_path in PROTECTED_PATHS: continue
 
-                    if include_patterns:
-                        if not any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in include_patterns):
+                    if include_matchers:
+                        if not any(match(rel_path) or match(name) for match in include_matchers):
                             continue
-                    if exclude_patterns:
-                        if any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in exclude_patterns):
+                    if exclude_matchers:
+                        if any(match(rel_path) or match(name) for match in exclude_matchers):
                             continue
                     
-                    target_files.append((file_path, rel_path))
+                    target_files.append((Path(entry.path), rel_path))
 
             # Helper for single file replace
             def replace_single_file(args):
@@ -364,21 +822,21 @@ class FileManager:
                     if pattern.search(content):
                         new_content, count = pattern.subn(replacement, content)
                         if count > 0:
-                            f_path.write_text(new_content, "utf-8")
+                            _replace_file(f_path, new_content.encode("utf-8"))
                             return (r_path, count)
                 except: pass
                 return None
 
             # Execute in parallel
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                futures = [executor.submit(replace_single_file, f) for f in target_files]
-                for future in concurrent.futures.as_completed(futures):
-                    res = future.result()
-                    if res:
-                        r_path, count = res
-                        files_updated += 1
-                        occurrences += count
-                        self._fire_update("write", r_path)
+            futures = [self._search_executor.submit(replace_single_file, f) for f in target_files]
+            for future in concurrent.futures.as_completed(futures):
+                res = future.result()
+                if res:
+                    r_path, count = res
+                    files_updated += 1
+                    occurrences += count
+                    # Replacing runs in a worker thread, events are fired from the loop
+                    self.hass.loop.call_soon_threadsafe(self._fire_update, "write", r_path)
 
             return {"success": True, "files_updated": files_updated, "occurrences": occurrences}
         except Exception as e:
@@ -387,42 +845,50 @@ class FileManager:
     async def read_file(self, path: str) -> web.Response:
         """Read file content."""
         safe_path = get_safe_path(self._get_root_dir(), path)
-        if not safe_path or not safe_path.is_file(): return json_message("File not found", status_code=404)
+        if not safe_path: return json_message("File not found", status_code=404)
         if not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
         try:
-            if safe_path.suffix.lower() in BINARY_EXTENSIONS:
-                content = await self.hass.async_add_executor_job(safe_path.read_bytes)
-                return json_response({"content": base64.b64encode(content).decode(), "is_base64": True, "mime_type": mimetypes.guess_type(safe_path.name)[0] or "application/octet-stream", "mtime": safe_path.stat().st_mtime})
-            content = await self.hass.async_add_executor_job(safe_path.read_text, "utf-8")
-            return json_response({"content": content, "is_base64": False, "mime_type": mimetypes.guess_type(safe_path.name)[0] or "text/plain;charset=utf-8", "mtime": safe_path.stat().st_mtime})
+            is_binary = _suffix(safe_path.name) in BINARY_EXTENSIONS
+            content, st = await self._run_in_executor(_read_file_content, safe_path, is_binary)
+            # A None content tells the editor to fetch the file with serve_file
+            if is_binary:
+                return json_response({"content": content, "is_base64": True, "mime_type": _guess_mime_type(safe_path.name) or "application/octet-stream", "mtime": st.st_mtime})
+            return json_response({"content": content, "is_base64": False, "mime_type": _guess_mime_type(safe_path.name) or "text/plain;charset=utf-8", "mtime": st.st_mtime})
+        except (FileNotFoundError, NotADirectoryError): return json_message("File not found", status_code=404)
         except Exception as e: return json_message(str(e), status_code=500)
 
-    async def serve_file(self, path: str) -> web.Response:
+    async def serve_file(self, path: str) -> web.StreamResponse:
         """Serve raw file content with correct MIME type."""
         safe_path = get_safe_path(self._get_root_dir(), path)
-        if not safe_path or not safe_path.is_file(): return web.Response(status=404, text="File not found")
+        if not safe_path: return web.Response(status=404, text="File not found")
         if not self._is_file_allowed(safe_path): return web.Response(status=403, text="Not allowed")
         try:
-            content = await self.hass.async_add_executor_job(safe_path.read_bytes)
-            mime_type = mimetypes.guess_type(safe_path.name)[0] or "application/octet-stream"
+            await self._run_in_executor(_stat_file, safe_path)
+            mime_type = _guess_mime_type(safe_path.name) or "application/octet-stream"
             
             # Add Content-Disposition: inline to encourage browser preview
             headers = {
                 "Content-Type": mime_type,
-                "Content-Disposition": f'inline; filename="{safe_path.name}"'
+                "Content-Disposition": f'inline; filename="{safe_path.name}"',
+                # Revalidate each time, FileResponse answers 304 from the file's
+                # ETag and Last-Modified when it has not changed
+                "Cache-Control": "private, no-cache",
             }
             
-            return web.Response(body=content, headers=headers)
+            # Sent with sendfile where the transport allows it, without reading the file in memory
+            return web.FileResponse(safe_path, chunk_size=SERVE_CHUNK_SIZE, headers=headers)
+        except (FileNotFoundError, NotADirectoryError): return web.Response(status=404, text="File not found")
         except Exception as e: return web.Response(status=500, text=str(e))
 
     async def get_file_stat(self, path: str) -> web.Response:
         """Get file statistics."""
         safe_path = get_safe_path(self._get_root_dir(), path)
-        if not safe_path or not safe_path.is_file(): return json_message("File not found", status_code=404)
+        if not safe_path: return json_message("File not found", status_code=404)
         if not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
         try:
-            stat = safe_path.stat()
-            return json_response({"success": True, "mtime": stat.st_mtime, "size": stat.st_size})
+            st = await self._run_in_executor(_stat_file, safe_path)
+            return json_response({"success": True, "mtime": st.st_mtime, "size": st.st_size})
+        except (FileNotFoundError, NotADirectoryError): return json_message("File not found", status_code=404)
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def write_file(self, path: str, content: str) -> web.Response:
@@ -430,35 +896,38 @@ class FileManager:
         safe_path = get_safe_path(self._get_root_dir(), path)
         if not safe_path or not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
         try:
-            await self.hass.async_add_executor_job(safe_path.write_text, content, "utf-8")
+            st = await self._run_write(_replace_file, safe_path, content.encode("utf-8"))
             self._fire_update("write", path)
-            return json_response({"success": True, "mtime": safe_path.stat().st_mtime})
+            return json_response({"success": True, "mtime": st.st_mtime})
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def create_file(self, path: str, content: str, is_base64: bool = False) -> web.Response:
         """Create a new file."""
         safe_path = get_safe_path(self._get_root_dir(), path)
         if not safe_path or not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
-        if safe_path.exists(): return json_message("Exists", status_code=409)
         try:
-            # Create parent directories if they don't exist
-            if not safe_path.parent.exists():
-                await self.hass.async_add_executor_job(safe_path.parent.mkdir, 0o755, True, True)
-
-            if is_base64: await self.hass.async_add_executor_job(safe_path.write_bytes, base64.b64decode(content))
-            else: await self.hass.async_add_executor_job(safe_path.write_text, content, "utf-8")
+            data = await self._run_write(base64.b64decode, content) if is_base64 else content.encode("utf-8")
+            try:
+                await self._run_write(_write_file, safe_path, data, True)
+            except FileNotFoundError:
+                # Create parent directories if they don't exist
+                await self._run_write(safe_path.parent.mkdir, 0o755, True, True)
+                await self._run_write(_write_file, safe_path, data, True)
             self._fire_update("create", path)
             return json_response({"success": True, "path": path})
+        except FileExistsError: return json_message("Exists", status_code=409)
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def create_folder(self, path: str) -> web.Response:
         """Create a new folder."""
         safe_path = get_safe_path(self._get_root_dir(), path)
-        if not safe_path or safe_path.exists(): return json_message("Not allowed or exists", status_code=403)
+        if not safe_path: return json_message("Not allowed or exists", status_code=403)
         try:
-            await self.hass.async_add_executor_job(safe_path.mkdir, 0o755, True, True)
+            # mkdir only creates the missing parents when it finds them missing
+            await self._run_write(safe_path.mkdir, 0o755, True, False)
             self._fire_update("create_folder", path)
             return json_response({"success": True, "path": path})
+        except FileExistsError: return json_message("Not allowed or exists", status_code=403)
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def delete(self, path: str) -> web.Response:
@@ -467,26 +936,26 @@ class FileManager:
         safe_path = get_safe_path(self._get_root_dir(), path)
         if not safe_path or not safe_path.exists() or safe_path == self._get_root_dir(): return json_message("Not found or not allowed", status_code=404)
         try:
-            if safe_path.is_dir(): await self.hass.async_add_executor_job(shutil.rmtree, safe_path)
-            else: await self.hass.async_add_executor_job(safe_path.unlink)
+            if safe_path.is_dir(): await self._run_write(shutil.rmtree, safe_path)
+            else: await self._run_write(safe_path.unlink)
             self._fire_update("delete", path)
             return json_response({"success": True})
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def delete_multi(self, paths: list[str]) -> web.Response:
         """Delete multiple files or folders."""
-        for path in paths:
-            if self._is_protected(path): continue # Skip protected
-            safe_path = get_safe_path(self._get_root_dir(), path)
-            if not safe_path or not safe_path.exists() or safe_path == self._get_root_dir(): continue
+        await self._run_write(self._bulk_delete, paths)
+        self._fire_update("delete_multi")
+        return json_response({"success": True})
+
+    def _bulk_delete(self, paths: list[str]) -> None:
+        """Delete multiple files or folders in one go, logging the failures."""
+        for path, safe_path, is_dir in self._resolve_targets(paths):
             try:
-                if safe_path.is_dir(): await self.hass.async_add_executor_job(shutil.rmtree, safe_path)
-                else: await self.hass.async_add_executor_job(safe_path.unlink)
+                if is_dir: shutil.rmtree(safe_path)
+                else: safe_path.unlink()
             except Exception as e:
                 _LOGGER.error("Error deleting %s: %s", path, e)
-        
-        self._fire_update("delete_multi")
-        return json_response({"success": True})
 
     async def move_multi(self, paths: list[str], destination: str | None) -> web.Response:
         """Move multiple files or folders to a destination."""
@@ -494,33 +963,45 @@ class FileManager:
         if not dest_folder or not dest_folder.is_dir():
             return json_message("Invalid destination", status_code=400)
 
-        for path in paths:
-            if self._is_protected(path): continue
-            src = get_safe_path(self._get_root_dir(), path)
-            if not src or not src.exists(): continue
-            
+        await self._run_write(self._bulk_move, paths, dest_folder, destination)
+        self._fire_update("move_multi")
+        return json_response({"success": True})
+
+    def _bulk_move(self, paths: list[str], dest_folder: Path, destination: str | None) -> None:
+        """Move multiple files or folders to a folder in one go, logging the failures."""
+        # Names already in the destination, listed once rather than checked per item
+        try:
+            with os.scandir(dest_folder) as it:
+                taken = {entry.name for entry in it}
+        except OSError:
+            taken = set()
+
+        for path, src, _ in self._resolve_targets(paths):
             # Destination path: dest_folder / original_filename
-            dest = dest_folder / src.name
-            
-            if dest.exists():
-                _LOGGER.warning("Move skipped: %s already exists in %s", src.name, destination)
+            name = src.name
+            if name in taken:
+                _LOGGER.warning("Move skipped: %s already exists in %s", name, destination)
                 continue
+            dest = dest_folder / name
 
             try:
-                await self.hass.async_add_executor_job(src.rename, dest)
+                try:
+                    os.rename(src, dest)
+                except OSError as err:
+                    # Moving to another file system needs a copy
+                    if err.errno != errno.EXDEV: raise
+                    shutil.move(src, dest)
+                taken.add(name)
             except Exception as e:
                 _LOGGER.error("Error moving %s to %s: %s", path, destination, e)
 
-        self._fire_update("move_multi")
-        return json_response({"success": True})
-
     async def copy(self, source: str, destination: str) -> web.Response:
         """Copy a file or folder."""
         src, dest = get_safe_path(self._get_root_dir(), source), get_safe_path(self._get_root_dir(), destination)
         if not src or not dest or not src.exists() or dest.exists(): return json_message("Invalid path or exists", status_code=403)
         try:
-            if src.is_dir(): await self.hass.async_add_executor_job(shutil.copytree, src, dest)
-            else: await self.hass.async_add_executor_job(shutil.copy2, src, dest)
+            if src.is_dir(): await self._run_write(shutil.copytree, src, dest)
+            else: await self._run_write(shutil.copy2, src, dest)
             self._fire_update("copy", destination)
             return json_response({"success": True, "path": destination})
         except Exception as e: return json_message(str(e), status_code=500)
@@ -531,56 +1012,88 @@ class FileManager:
         src, dest = get_safe_path(self._get_root_dir(), source), get_safe_path(self._get_root_dir(), destination)
         if not src or not dest or not src.exists() or dest.exists(): return json_message("Invalid path or exists", status_code=403)
         try:
-            await self.hass.async_add_executor_job(src.rename, dest)
+            await self._run_write(src.rename, dest)
             self._fire_update("rename", destination)
             return json_response({"success": True, "path": destination})
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def download_folder(self, path: str) -> web.Response:
-        """Download folder as ZIP."""
+        """Download folder as a streamed ZIP."""
         safe_path = get_safe_path(self._get_root_dir(), path)
         if not safe_path or not safe_path.is_dir(): return json_message("Not found", status_code=404)
         try:
-            zip_data = await self.hass.async_add_executor_job(self._create_zip, safe_path)
-            return json_response({"success": True, "filename": f"{safe_path.name}.zip", "data": zip_data})
+            zip_file = await self._run_in_executor(self._create_zip, safe_path)
         except Exception as e: return json_message(str(e), status_code=500)
+        return web.Response(
+            body=self._iter_file(zip_file),
+            content_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{safe_path.name}.zip"'},
+        )
 
     async def download_multi(self, paths: list[str]) -> web.Response:
-        """Download multiple items as ZIP."""
+        """Download multiple items as a streamed ZIP."""
         try:
-            zip_data = await self.hass.async_add_executor_job(self._create_multi_zip, paths)
-            return json_response({"success": True, "filename": "download.zip", "data": zip_data})
+            zip_file = await self._run_in_executor(self._create_multi_zip, paths)
         except Exception as e: return json_message(str(e), status_code=500)
-
-    def _create_zip(self, folder_path: Path) -> str:
-        """Create ZIP from folder."""
-        buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(folder_path):
-                dirs[:] = [d for d in dirs if d not in EXCLUDED_PATTERNS and not d.startswith(".")]
-                for f in files:
-                    if f.startswith(".") or not self._is_file_allowed(Path(root) / f): continue
-                    zf.write(Path(root) / f, (Path(root) / f).relative_to(folder_path))
+        return web.Response(
+            body=self._iter_file(zip_file),
+            content_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="download.zip"'},
+        )
+
+    async def _iter_file(self, file: IO[bytes]) -> AsyncIterator[bytes]:
+        """Read an open file in chunks, closing it once done."""
+        try:
+            while chunk := await self._run_in_executor(file.read, ZIP_CHUNK_SIZE):
+                yield chunk
+        finally:
+            file.close()
+
+    def _create_zip(self, folder_path: Path) -> IO[bytes]:
+        """Create ZIP from folder in a temporary file, returned rewound."""
+        buf = tempfile.TemporaryFile()
+        try:
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as zf:
+                root_prefix = len(os.path.join(self._get_root_dir(), ""))
+                prefix = len(os.path.join(folder_path, ""))
+                write = zf.write
+                for root, dirs, files in _scandir_walk(folder_path):
+                    for entry in files:
+                        if entry.name[:1] == "." or not self._is_rel_path_allowed(entry.path[root_prefix:], entry.name): continue
+                        write(entry.path, entry.path[prefix:], _zip_compress_type(entry.name))
+        except BaseException:
+            buf.close()
+            raise
         buf.seek(0)
-        return base64.b64encode(buf.read()).decode()
-
-    def _create_multi_zip(self, paths: list[str]) -> str:
-        """Create ZIP from multiple paths."""
-        buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-            for p in paths:
-                safe = get_safe_path(self._get_root_dir(), p)
-                if not safe or not safe.exists(): continue
-                if safe.is_file():
-                    if self._is_file_allowed(safe): zf.write(safe, safe.name)
-                elif safe.is_dir():
-                    for root, dirs, files in os.walk(safe):
-                        dirs[:] = [d for d in dirs if d not in EXCLUDED_PATTERNS and not d.startswith(".")]
-                        for f in files:
-                            if f.startswith(".") or not self._is_file_allowed(Path(root) / f): continue
-                            zf.write(Path(root) / f, (Path(root) / f).relative_to(safe.parent))
+        return buf
+
+    def _create_multi_zip(self, paths: list[str]) -> IO[bytes]:
+        """Create ZIP from multiple paths in a temporary file, returned rewound."""
+        buf = tempfile.TemporaryFile()
+        try:
+            root_prefix = len(os.path.join(self._get_root_dir(), ""))
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as zf:
+                write = zf.write
+                for p in paths:
+                    safe = get_safe_path(self._get_root_dir(), p)
+                    if not safe: continue
+                    try:
+                        mode = os.stat(safe).st_mode
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(mode):
+                        if self._is_rel_path_allowed(str(safe)[root_prefix:], safe.name): write(safe, safe.name, _zip_compress_type(safe.name))
+                    elif stat.S_ISDIR(mode):
+                        prefix = len(os.path.join(safe.parent, ""))
+                        for root, dirs, files in _scandir_walk(safe):
+                            for entry in files:
+                                if entry.name[:1] == "." or not self._is_rel_path_allowed(entry.path[root_prefix:], entry.name): continue
+                                write(entry.path, entry.path[prefix:], _zip_compress_type(entry.name))
+        except BaseException:
+            buf.close()
+            raise
         buf.seek(0)
-        return base64.b64encode(buf.read()).decode()
+        return buf
 
     async def upload_file(self, path: str, content: str, overwrite: bool, is_base64: bool = False) -> web.Response:
         """Upload/create a file with content."""
@@ -588,33 +1101,78 @@ class FileManager:
         if not safe_path or not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
         if safe_path.exists() and not overwrite: return json_message("File already exists", status_code=409)
         try:
-            if is_base64: await self.hass.async_add_executor_job(safe_path.write_bytes, base64.b64decode(content))
-            else: await self.hass.async_add_executor_job(safe_path.write_text, content, "utf-8")
+            data = await self._run_write(base64.b64decode, content) if is_base64 else content.encode("utf-8")
+            await self._run_write(_replace_file, safe_path, data)
             self._fire_update("upload", path)
             return json_response({"success": True, "path": path})
         except Exception as e: return json_message(str(e), status_code=500)
 
-    async def upload_folder(self, path: str, zip_data: str) -> web.Response:
-        """Upload ZIP and extract to folder."""
+    async def upload_file_part(self, path: str, part: BodyPartReader, overwrite: bool) -> web.Response:
+        """Upload a file streamed from a multipart field."""
+        safe_path = get_safe_path(self._get_root_dir(), path)
+        if not safe_path or not self._is_file_allowed(safe_path): return json_message("Not allowed", status_code=403)
+        if safe_path.exists() and not overwrite: return json_message("File already exists", status_code=409)
+        try:
+            upload = await self._spool_part(part)
+            try:
+                await self._run_write(_replace_file, safe_path, upload)
+            finally:
+                upload.close()
+            self._fire_update("upload", path)
+            return json_response({"success": True, "path": path})
+        except Exception as e: return json_message(str(e), status_code=500)
+
+    async def _spool_part(self, part: BodyPartReader) -> IO[bytes]:
+        """Spool a multipart field, rolling over to disk once it grows past UPLOAD_SPOOL_SIZE, returned rewound."""
+        spool = tempfile.SpooledTemporaryFile(UPLOAD_SPOOL_SIZE)
+        size = 0
+        try:
+            while chunk := await part.read_chunk(ZIP_CHUNK_SIZE):
+                size += len(chunk)
+                # Chunks kept in memory are written inline, only the write
+                # rolling the spool over to disk and the ones after it block
+                if size <= UPLOAD_SPOOL_SIZE:
+                    spool.write(chunk)
+                else:
+                    await self._run_write(spool.write, chunk)
+            spool.seek(0)
+        except BaseException:
+            spool.close()
+            raise
+        return spool
+
+    async def upload_folder(self, path: str, part: BodyPartReader) -> web.Response:
+        """Upload ZIP streamed from a multipart field and extract to folder."""
         safe_path = get_safe_path(self._get_root_dir(), path)
         if not safe_path: return json_message("Invalid path", status_code=400)
 
         # Create the folder if it doesn't exist
         if not safe_path.exists():
             try:
-                await self.hass.async_add_executor_job(safe_path.mkdir, True, True)  # parents=True, exist_ok=True
+                await self._run_write(safe_path.mkdir, True, True)  # parents=True, exist_ok=True
             except Exception as e:
                 return json_message(f"Failed to create folder: {str(e)}", status_code=500)
 
         try:
-            zip_bytes = base64.b64decode(zip_data)
-            buf = io.BytesIO(zip_bytes)
-            files_extracted = 0
-            with zipfile.ZipFile(buf) as zf:
-                for member in zf.namelist():
-                    if not member.endswith("/") and self._is_file_allowed(safe_path / member):
-                        zf.extract(member, safe_path)
-                        files_extracted += 1
+            zip_file = await self._spool_part(part)
+            try:
+                files_extracted = await self._run_write(self._extract_zip, zip_file, safe_path)
+            finally:
+                zip_file.close()
             self._fire_update("upload_folder", path)
             return json_response({"success": True, "files_extracted": files_extracted})
         except Exception as e: return json_message(str(e), status_code=500)
+
+    def _extract_zip(self, zip_file: IO[bytes], folder_path: Path) -> int:
+        """Extract allowed files of a ZIP to folder, returning how many were extracted."""
+        files_extracted = 0
+        rel_prefix = os.path.join(str(folder_path)[len(os.path.join(self._get_root_dir(), "")):], "")
+        with zipfile.ZipFile(zip_file) as zf:
+            for info in zf.infolist():
+                member = info.filename
+                # Skip members escaping the folder rather than let extract rewrite them
+                if info.is_dir() or member.startswith("/") or ".." in member.split("/"): continue
+                if not self._is_rel_path_allowed(rel_prefix + member, member.rpartition("/")[2]): continue
+                zf.extract(info, folder_path)
+                files_extracted += 1
+        return files_extracted
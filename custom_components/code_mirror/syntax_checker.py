@@ -1,21 +1,29 @@
 "Syntax checker for CodeMirror."
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
 import yaml
 import time
+from collections import OrderedDict
+from typing import Callable
 from aiohttp import web
 from homeassistant.core import HomeAssistant
 
-from .util import json_response, json_message
+from .util import json_body_response, json_bytes
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of recent check results kept per checker; the editor re-validates the
+# same content repeatedly (debounced keystrokes, tab switches)
+RESULT_CACHE_SIZE = 128
+
 # Common YAML errors and their solutions
 YAML_ERROR_PATTERNS = {
     "legacy_service": {
-        "pattern": r"^\s*service:\s*(\w+\.\w+)",
+        "pattern": r"^[^\S\n]*service:[^\S\n]*(\w+\.\w+)",
         "message": "Legacy 'service:' syntax detected",
         "solution": "Replace 'service:' with 'action:' (modern 2024+ syntax)",
         "example": "service: light.turn_on  →  action: light.turn_on"
@@ -27,13 +35,13 @@ YAML_ERROR_PATTERNS = {
         "example": "- alias: My Auto  →  - id: '1738012345678'\n  alias: My Auto"
     },
     "singular_trigger": {
-        "pattern": r"^\s*trigger:\s*$",
+        "pattern": r"^[^\S\n]*trigger:[^\S\n]*$",
         "message": "Legacy singular 'trigger:' key detected",
         "solution": "Use modern plural 'triggers:' instead",
         "example": "trigger:  →  triggers:"
     },
     "singular_condition": {
-        "pattern": r"^\s*condition:\s*$",
+        "pattern": r"^[^\S\n]*condition:[^\S\n]*$",
         "message": "Legacy singular 'condition:' key detected",
         "solution": "Use modern plural 'conditions:' instead",
         "example": "condition:  →  conditions:"
@@ -45,7 +53,7 @@ YAML_ERROR_PATTERNS = {
         "example": "action:  →  actions:"
     },
     "old_trigger_syntax": {
-        "pattern": r"^\s*-\s+platform:\s+(\w+)",
+        "pattern": r"^[^\S\n]*-[^\S\n]+platform:[^\S\n]+(\w+)",
         "message": "Legacy 'platform:' trigger syntax detected",
         "solution": "Use modern '- trigger: platform' syntax",
         "example": "- platform: time  →  - trigger: time"
@@ -56,18 +64,6 @@ YAML_ERROR_PATTERNS = {
         "solution": "Add 'metadata: {}' after action declaration",
         "example": "action: light.turn_on\ntarget:  →  action: light.turn_on\nmetadata: {}\ntarget:"
     },
-    "malformed_entity_id": {
-        "pattern": r"entity_id:\s+([a-zA-Z_]+)(?!\.[a-zA-Z_])",
-        "message": "Malformed entity_id (missing domain or entity name)",
-        "solution": "Entity IDs must follow format: domain.entity_name",
-        "example": "entity_id: kitchen  →  entity_id: light.kitchen"
-    },
-    "invalid_domain": {
-        "pattern": r"entity_id:\s+([a-zA-Z0-9_]+)\.",
-        "message": "Potentially invalid domain in entity_id",
-        "solution": "Check if domain exists in Home Assistant",
-        "example": "Common domains: light, switch, sensor, binary_sensor, climate, etc."
-    },
 }
 
 # Common Jinja2 template patterns for Home Assistant
@@ -134,19 +130,204 @@ JINJA_ERROR_PATTERNS = {
         "example": "states(sensor.temp) → states('sensor.temp')"
     },
     "wrong_brackets": {
-        "pattern": r"\{\{\s*\{",
+        "pattern": r"\{\{[^\S\n]*\{",
         "message": "Too many opening brackets",
         "solution": "Use {{ for expressions, not {{{",
         "example": "{{{ value }}} → {{ value }}"
     },
     "missing_pipe": {
-        "pattern": r"states\(['\"][\w\.]+['\"]\)\s*(float|int|round|default)",
+        "pattern": r"states\(['\"][\w\.]+['\"]\)[^\S\n]*(float|int|round|default)",
         "message": "Missing pipe | for filter",
         "solution": "Use | before filter name",
         "example": "states('sensor.temp') float → states('sensor.temp') | float"
     },
 }
 
+# Line checks, merged into a single alternation compiled once at import so the
+# whole document is scanned in one pass. Patterns only match horizontal
+# whitespace ([^\S\n]) so a match never spans two lines.
+_LINE_START = r"^[^\S\n]*"
+# Checks anchored at the start of a line share their indentation prefix, which
+# is then consumed once instead of once per alternative
+_YAML_LINE_START_CHECKS = {
+    "legacy_service": YAML_ERROR_PATTERNS["legacy_service"]["pattern"].removeprefix(_LINE_START),
+    "old_trigger_syntax": YAML_ERROR_PATTERNS["old_trigger_syntax"]["pattern"].removeprefix(_LINE_START),
+    # Bare "trigger:" / "condition:" keys share one alternative, the key name
+    # is then classified with a dict lookup
+    "singular_key": r"(?P<singular_name>trigger|condition):[^\S\n]*$",
+}
+_YAML_LINE_CHECKS = {
+    # Value captured without its surrounding quotes, so "" and '' give an
+    # empty capture that is still reported as malformed
+    "entity_id": r"entity_id:[^\S\n]+(?=\S)['\"]?(?P<entity_value>[^'\"\s]*)",
+}
+
+# "alias:" line, capturing the value with its quotes or trailing comment removed
+_ALIAS_RE = re.compile(
+    r"^[^\S\n]*(?:-[^\S\n]+)?alias:[^\S\n]*"
+    r"(?:\"(?P<dq>[^\"\n]*)\"|'(?P<sq>[^'\n]*)'|(?P<plain>.*?)(?:[^\S\n]+#.*)?)[^\S\n]*$",
+    re.MULTILINE,
+)
+
+_YAML_COMBINED = re.compile(
+    _LINE_START
+    + "(?:"
+    + "|".join(f"(?P<{key}>{pattern})" for key, pattern in _YAML_LINE_START_CHECKS.items())
+    + ")|"
+    + "|".join(f"(?P<{key}>{pattern})" for key, pattern in _YAML_LINE_CHECKS.items()),
+    re.MULTILINE,
+)
+_JINJA_COMBINED = re.compile(
+    "|".join(f"(?P<{key}>{value['pattern']})" for key, value in JINJA_ERROR_PATTERNS.items()),
+    re.MULTILINE,
+)
+
+_SINGULAR_KEYS = {"trigger": "singular_trigger", "condition": "singular_condition"}
+
+# Every pattern above contains one of these literals; when none of them is in
+# the content the regex scan cannot match and is skipped entirely
+_YAML_LITERALS = ("service:", "platform:", "trigger:", "condition:", "entity_id:")
+_JINJA_LITERALS = ("states(", "{{")
+
+
+def _iter_line_matches(pattern: re.Pattern, literals: tuple[str, ...], content: str):
+    """Yield (line_num, line, match) for every match, at most once per group and line."""
+    if not any(literal in content for literal in literals):
+        return
+    line_num = 1
+    last_pos = 0
+    seen = set()
+    for match in pattern.finditer(content):
+        start = match.start()
+        newlines = content.count("\n", last_pos, start)
+        if newlines:
+            line_num += newlines
+            seen.clear()
+        last_pos = start
+        key = match.lastgroup
+        if key in seen:
+            continue
+        seen.add(key)
+        line_start = content.rfind("\n", 0, start) + 1
+        line_end = content.find("\n", start)
+        line = content[line_start:line_end] if line_end != -1 else content[line_start:]
+        yield line_num, line, match
+
+
+def _malformed_entity_error(line_num: int, line: str, match: re.Match) -> dict | None:
+    """Build a syntax error for an entity_id missing its domain, if any."""
+    entity_id = match.group("entity_value")
+    if '.' in entity_id or entity_id.startswith('['):
+        return None
+    return {
+        "line": line_num,
+        "type": "malformed_entity_id",
+        "message": f"Malformed entity_id: '{entity_id}'",
+        "solution": "Entity IDs must follow format: domain.entity_name",
+        "example": f"entity_id: light.{entity_id}",
+        "original": line.strip()
+    }
+
+
+# Fixed part of each reported issue, built once; only "line" and "original"
+# are filled in per match
+_YAML_TEMPLATES = {
+    key: {
+        "type": issue_type,
+        "message": YAML_ERROR_PATTERNS[key]["message"],
+        "solution": YAML_ERROR_PATTERNS[key]["solution"],
+        "example": YAML_ERROR_PATTERNS[key]["example"],
+    }
+    for key, issue_type in (
+        ("legacy_service", "legacy_syntax"),
+        ("old_trigger_syntax", "legacy_trigger"),
+        ("singular_trigger", "singular_key"),
+        ("singular_condition", "singular_key"),
+    )
+}
+_JINJA_TEMPLATES = {
+    key: {
+        "type": "syntax_error",
+        "message": value["message"],
+        "solution": value["solution"],
+        "example": value["example"],
+    }
+    for key, value in JINJA_ERROR_PATTERNS.items()
+}
+
+
+def _yaml_line_issue(line_num: int, line: str, match: re.Match) -> dict | None:
+    """Build the warning or syntax error reported for a combined YAML match."""
+    key = match.lastgroup
+    if key == "singular_key":
+        key = _SINGULAR_KEYS[match.group("singular_name")]
+    template = _YAML_TEMPLATES.get(key)
+    if template is None:
+        return _malformed_entity_error(line_num, line, match)
+    return {"line": line_num, **template, "original": line.strip()}
+
+
+# Example fix for an automation without id, filled with the suggested id
+_MISSING_ID_EXAMPLE = "- id: '{timestamp}'\n  alias: {alias}"
+
+
+_YAML_VALID = {
+    "valid": True,
+    "message": "YAML is valid and follows best practices!"
+}
+_JINJA_VALID = {
+    "valid": True,
+    "suggestions": [],
+    "message": "Jinja template syntax looks good!",
+    "tip": "Use {{ }} for expressions and {% %} for statements"
+}
+# Constant results are sent as pre-encoded bodies
+_YAML_VALID_BODY = json_bytes(_YAML_VALID)
+_JINJA_VALID_BODY = json_bytes(_JINJA_VALID)
+
+# Content made only of these is treated as empty
+_BLANK_CHARS = " \r\n"
+
+_YAML_SYNTAX_SUGGESTIONS = [
+    "Check for proper indentation (use 2 spaces, not tabs)",
+    "Ensure all quotes are properly closed",
+    "Verify that list items start with '-' followed by a space",
+    "Check for special characters that need quoting"
+]
+
+
+def _serialize(result: dict) -> bytes:
+    """Serialize a check result, reusing the pre-encoded constant results."""
+    if result is _YAML_VALID:
+        return _YAML_VALID_BODY
+    if result is _JINJA_VALID:
+        return _JINJA_VALID_BODY
+    return json_bytes(result)
+
+
+def _ha_constructor(loader: yaml.SafeLoader, node: yaml.Node) -> str:
+    return loader.construct_scalar(node)
+
+
+def _make_ha_loader(base: type) -> type:
+    """Create a safe loader class accepting Home Assistant specific tags."""
+    class HAYamlLoader(base):
+        pass
+
+    for tag in (
+        "!include", "!include_dir_list", "!include_dir_named", "!include_dir_merge_list",
+        "!include_dir_merge_named", "!secret", "!env_var", "!input",
+    ):
+        HAYamlLoader.add_constructor(tag, _ha_constructor)
+    return HAYamlLoader
+
+
+# Built once at import. Parse with libyaml when PyYAML was built with it; the
+# pure Python loader is kept to report errors, as its messages quote the
+# offending line
+_HA_YAML_LOADER = _make_ha_loader(getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+_HA_YAML_ERROR_LOADER = _make_ha_loader(yaml.SafeLoader)
+
 
 class SyntaxChecker:
     """Class to handle syntax checking and validation for CodeMirror."""
@@ -155,178 +336,143 @@ class SyntaxChecker:
         """Initialize syntax checker."""
         self.hass = hass
         self.data = data
+        self._yaml_cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._jinja_cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _cached_check(
+        self, cache: OrderedDict[bytes, bytes], content: str, check: Callable[[str], dict]
+    ) -> bytes:
+        """Return the serialized result of check(content), reusing recent results.
+
+        Results are keyed by the content alone, so check must only depend on
+        it. Diagnostics that read live state such as hass.states have to run
+        outside of this cache, or they would keep reporting a stale state.
+        """
+        key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._cache_lock:
+            body = cache.get(key)
+            if body is not None:
+                cache.move_to_end(key)
+                return body
+
+        body = _serialize(check(content))
+        with self._cache_lock:
+            cache[key] = body
+            if len(cache) > RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return body
 
     def check_yaml(self, content: str) -> web.Response:
         """Check for YAML syntax errors and provide smart solutions."""
-        syntax_errors = []
-        best_practice_warnings = []
+        return json_body_response(self.check_yaml_body(content))
+
+    def check_jinja(self, content: str) -> web.Response:
+        """Check Jinja2 template syntax and provide intelligent suggestions."""
+        return json_body_response(self.check_jinja_body(content))
 
+    def check_yaml_body(self, content: str) -> bytes:
+        """Return the YAML check result as a JSON body."""
+        # Nothing to parse, e.g. a file that was just created or cleared. Tabs
+        # and other whitespace still go through the checks, which report them
+        if not content.strip(_BLANK_CHARS):
+            return _YAML_VALID_BODY
+        return self._cached_check(self._yaml_cache, content, self._check_yaml)
+
+    def check_jinja_body(self, content: str) -> bytes:
+        """Return the Jinja check result as a JSON body."""
+        if not content.strip(_BLANK_CHARS):
+            return _JINJA_VALID_BODY
+        return self._cached_check(self._jinja_cache, content, self._check_jinja)
+
+    def _check_yaml(self, content: str) -> dict:
+        """Run the YAML checks and return the result payload."""
         # First check basic YAML syntax
         try:
-            class HAYamlLoader(yaml.SafeLoader): pass
-            def ha_constructor(loader, node): return loader.construct_scalar(node)
-            tags = ['!include', '!include_dir_list', '!include_dir_named', '!include_dir_merge_list', '!include_dir_merge_named', '!secret', '!env_var', '!input']
-            for tag in tags: HAYamlLoader.add_constructor(tag, ha_constructor)
-            parsed = yaml.load(content, Loader=HAYamlLoader)
+            parsed = yaml.load(content, Loader=_HA_YAML_LOADER)
         except yaml.YAMLError as e:
-            return json_response({
+            if _HA_YAML_LOADER is not _HA_YAML_ERROR_LOADER:
+                try:
+                    yaml.load(content, Loader=_HA_YAML_ERROR_LOADER)
+                except yaml.YAMLError as detailed:
+                    e = detailed
+            return {
                 "valid": False,
                 "error": str(e),
                 "type": "syntax_error",
-                "suggestions": [
-                    "Check for proper indentation (use 2 spaces, not tabs)",
-                    "Ensure all quotes are properly closed",
-                    "Verify that list items start with '-' followed by a space",
-                    "Check for special characters that need quoting"
-                ]
-            })
+                "suggestions": _YAML_SYNTAX_SUGGESTIONS
+            }
         except Exception as e:
-            return json_response({"valid": False, "error": str(e)})
+            return {"valid": False, "error": str(e)}
 
         # Advanced validation - check for common mistakes and legacy syntax
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Check for legacy service: syntax
-            if re.search(YAML_ERROR_PATTERNS["legacy_service"]["pattern"], line):
-                best_practice_warnings.append({
-                    "line": line_num,
-                    "type": "legacy_syntax",
-                    "message": YAML_ERROR_PATTERNS["legacy_service"]["message"],
-                    "solution": YAML_ERROR_PATTERNS["legacy_service"]["solution"],
-                    "example": YAML_ERROR_PATTERNS["legacy_service"]["example"],
-                    "original": line.strip()
-                })
-
-            # Check for old trigger platform: syntax
-            if re.search(YAML_ERROR_PATTERNS["old_trigger_syntax"]["pattern"], line):
-                best_practice_warnings.append({
-                    "line": line_num,
-                    "type": "legacy_trigger",
-                    "message": YAML_ERROR_PATTERNS["old_trigger_syntax"]["message"],
-                    "solution": YAML_ERROR_PATTERNS["old_trigger_syntax"]["solution"],
-                    "example": YAML_ERROR_PATTERNS["old_trigger_syntax"]["example"],
-                    "original": line.strip()
-                })
-
-            # Check for singular keys
-            if re.match(r"^\s*trigger:\s*$", line):
-                best_practice_warnings.append({
-                    "line": line_num,
-                    "type": "singular_key",
-                    "message": YAML_ERROR_PATTERNS["singular_trigger"]["message"],
-                    "solution": YAML_ERROR_PATTERNS["singular_trigger"]["solution"],
-                    "example": YAML_ERROR_PATTERNS["singular_trigger"]["example"],
-                    "original": line.strip()
-                })
-
-            if re.match(r"^\s*condition:\s*$", line):
-                best_practice_warnings.append({
-                    "line": line_num,
-                    "type": "singular_key",
-                    "message": YAML_ERROR_PATTERNS["singular_condition"]["message"],
-                    "solution": YAML_ERROR_PATTERNS["singular_condition"]["solution"],
-                    "example": YAML_ERROR_PATTERNS["singular_condition"]["example"],
-                    "original": line.strip()
-                })
-
-            # Check for malformed entity_id
-            entity_match = re.search(r"entity_id:\s+([^\s\n]+)", line)
-            if entity_match:
-                entity_id = entity_match.group(1)
-                # Remove quotes if present
-                entity_id = entity_id.strip('"\'')
-                if '.' not in entity_id and not entity_id.startswith('['):
-                    syntax_errors.append({
-                        "line": line_num,
-                        "type": "malformed_entity_id",
-                        "message": f"Malformed entity_id: '{entity_id}'",
-                        "solution": "Entity IDs must follow format: domain.entity_name",
-                        "example": f"entity_id: light.{entity_id}",
-                        "original": line.strip()
-                    })
+        issues = [
+            issue
+            for line_num, line, match in _iter_line_matches(_YAML_COMBINED, _YAML_LITERALS, content)
+            if (issue := _yaml_line_issue(line_num, line, match)) is not None
+        ]
+        syntax_errors = [issue for issue in issues if issue["type"] == "malformed_entity_id"]
+        best_practice_warnings = [issue for issue in issues if issue["type"] != "malformed_entity_id"]
 
         # Check for missing automation id
         if isinstance(parsed, list):
-            for idx, item in enumerate(parsed):
-                if isinstance(item, dict) and 'alias' in item and 'id' not in item:
-                    # Find the line with this alias
-                    alias_value = item['alias']
-                    for line_num, line in enumerate(lines, 1):
-                        if f"alias: {alias_value}" in line or f'alias: "{alias_value}"' in line or f"alias: '{alias_value}'" in line:
-                            best_practice_warnings.append({
-                                "line": line_num,
-                                "type": "missing_id",
-                                "message": f"Automation '{alias_value}' missing unique 'id:' field",
-                                "solution": YAML_ERROR_PATTERNS["missing_id"]["solution"],
-                                "example": f"- id: '{int(time.time() * 1000)}'\n  alias: {alias_value}",
-                                "original": line.strip()
-                            })
-                            break
+            missing_id = [
+                item['alias'] for item in parsed
+                if isinstance(item, dict) and 'alias' in item and 'id' not in item
+            ]
+            if missing_id:
+                # Index the first line of every alias in a single regex scan
+                alias_lines: dict[str, tuple[int, str]] = {}
+                for line_num, line, match in _iter_line_matches(_ALIAS_RE, ("alias:",), content):
+                    value = match.group("dq")
+                    if value is None:
+                        value = match.group("sq")
+                    if value is None:
+                        value = match.group("plain")
+                    alias_lines.setdefault(value, (line_num, line.strip()))
+
+                timestamp = int(time.time() * 1000)
+                for alias_value in missing_id:
+                    found = alias_lines.get(str(alias_value))
+                    if found is None:
+                        continue
+                    line_num, original = found
+                    best_practice_warnings.append({
+                        "line": line_num,
+                        "type": "missing_id",
+                        "message": f"Automation '{alias_value}' missing unique 'id:' field",
+                        "solution": YAML_ERROR_PATTERNS["missing_id"]["solution"],
+                        "example": _MISSING_ID_EXAMPLE.format(timestamp=timestamp, alias=alias_value),
+                        "original": original
+                    })
 
         # Return results
         if syntax_errors:
-            return json_response({
+            return {
                 "valid": False,
                 "errors": syntax_errors,
                 "error_count": len(syntax_errors),
                 "message": f"Found {len(syntax_errors)} syntax error(s)"
-            })
+            }
 
         if best_practice_warnings:
-            return json_response({
+            return {
                 "valid": True,
                 "warnings": best_practice_warnings,
                 "warning_count": len(best_practice_warnings),
                 "message": f"YAML is valid but found {len(best_practice_warnings)} best practice issue(s)"
-            })
+            }
 
-        return json_response({
-            "valid": True,
-            "message": "YAML is valid and follows best practices!"
-        })
+        return _YAML_VALID
 
-    def check_jinja(self, content: str) -> web.Response:
-        """Check Jinja2 template syntax and provide intelligent suggestions."""
-        errors = []
+    def _check_jinja(self, content: str) -> dict:
+        """Run the Jinja checks and return the result payload."""
+        errors = [
+            {"line": line_num, **_JINJA_TEMPLATES[match.lastgroup], "original": line.strip()}
+            for line_num, line, match in _iter_line_matches(_JINJA_COMBINED, _JINJA_LITERALS, content)
+        ]
         suggestions = []
 
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Check for missing quotes in states()
-            if re.search(JINJA_ERROR_PATTERNS["missing_quotes"]["pattern"], line):
-                errors.append({
-                    "line": line_num,
-                    "type": "syntax_error",
-                    "message": JINJA_ERROR_PATTERNS["missing_quotes"]["message"],
-                    "solution": JINJA_ERROR_PATTERNS["missing_quotes"]["solution"],
-                    "example": JINJA_ERROR_PATTERNS["missing_quotes"]["example"],
-                    "original": line.strip()
-                })
-
-            # Check for wrong brackets
-            if re.search(JINJA_ERROR_PATTERNS["wrong_brackets"]["pattern"], line):
-                errors.append({
-                    "line": line_num,
-                    "type": "syntax_error",
-                    "message": JINJA_ERROR_PATTERNS["wrong_brackets"]["message"],
-                    "solution": JINJA_ERROR_PATTERNS["wrong_brackets"]["solution"],
-                    "example": JINJA_ERROR_PATTERNS["wrong_brackets"]["example"],
-                    "original": line.strip()
-                })
-
-            # Check for missing pipe
-            if re.search(JINJA_ERROR_PATTERNS["missing_pipe"]["pattern"], line):
-                errors.append({
-                    "line": line_num,
-                    "type": "syntax_error",
-                    "message": JINJA_ERROR_PATTERNS["missing_pipe"]["message"],
-                    "solution": JINJA_ERROR_PATTERNS["missing_pipe"]["solution"],
-                    "example": JINJA_ERROR_PATTERNS["missing_pipe"]["example"],
-                    "original": line.strip()
-                })
-
         # Provide helpful suggestions based on content
         if "states(" in content:
             suggestions.append({
@@ -350,17 +496,14 @@ class SyntaxChecker:
             })
 
         if errors:
-            return json_response({
+            return {
                 "valid": False,
                 "errors": errors,
                 "suggestions": suggestions,
                 "error_count": len(errors),
                 "message": f"Found {len(errors)} error(s) in Jinja template"
-            })
+            }
 
-        return json_response({
-            "valid": True,
-            "suggestions": suggestions,
-            "message": "Jinja template syntax looks good!",
-            "tip": "Use {{ }} for expressions and {% %} for statements"
-        })
+        if not suggestions:
+            return _JINJA_VALID
+        return {**_JINJA_VALID, "suggestions": suggestions}
@@ -1,21 +1,41 @@
 """Utility functions for CodeMirror."""
 from __future__ import annotations
 
+import hashlib
 import logging
 from pathlib import Path
 from typing import Any
 
-from aiohttp import web
+import orjson
+from aiohttp import hdrs, web
 
 _LOGGER = logging.getLogger(__name__)
 
 def json_response(data: Any, status_code: int = 200) -> web.Response:
     """Return a JSON response."""
-    return web.json_response(data, status=status_code)
+    return json_body_response(orjson.dumps(data), status_code)
+
+def json_bytes(data: Any) -> bytes:
+    """Serialize data to a JSON body."""
+    return orjson.dumps(data)
+
+def json_body_response(body: bytes, status_code: int = 200) -> web.Response:
+    """Return a JSON response from an already serialized body."""
+    return web.Response(body=body, status=status_code, content_type="application/json")
+
+def etag_response(request: web.Request, response: web.Response) -> web.Response:
+    """Tag a response with an ETag of its body, answering 304 when the client has it."""
+    etag = hashlib.blake2b(response.body, digest_size=8).hexdigest()
+    if any(tag.value in (etag, "*") for tag in request.if_none_match or ()):
+        response = web.Response(status=304)
+    response.etag = etag
+    # Let the browser keep the body but revalidate it on every request
+    response.headers[hdrs.CACHE_CONTROL] = "private, no-cache"
+    return response
 
 def json_message(message: str, success: bool = False, status_code: int = 200) -> web.Response:
     """Return a JSON message response."""
-    return web.json_response({"success": success, "message": message}, status=status_code)
+    return json_response({"success": success, "message": message}, status_code)
 
 def is_path_safe(config_dir: Path, path: str) -> bool:
     """Check if the path is safe (no path traversal).
@@ -27,12 +47,7 @@ def is_path_safe(config_dir: Path, path: str) -> bool:
     Returns:
         True if the path is safe to access, False otherwise
     """
-    try:
-        full_path = (config_dir / path.lstrip("/")).resolve()
-        # Must be within config_dir
-        return full_path.is_relative_to(config_dir)
-    except (ValueError, OSError):
-        return False
+    return get_safe_path(config_dir, path) is not None
 
 def get_safe_path(config_dir: Path, path: str) -> Path | None:
     """Get a safe, resolved path.
@@ -44,14 +59,15 @@ def get_safe_path(config_dir: Path, path: str) -> Path | None:
     Returns:
         Resolved Path if safe, None otherwise
     """
-    if not is_path_safe(config_dir, path):
+    try:
+        full_path = (config_dir / path.lstrip("/")).resolve()
+    except (ValueError, OSError):
+        return None
+    # Must be within config_dir
+    if not full_path.is_relative_to(config_dir):
         _LOGGER.warning(
             "Path blocked by safety check: %s (config_dir: %s)",
             path, config_dir
         )
         return None
-
-    full_path = (config_dir / path.lstrip("/")).resolve()
-    return full_path
-    _LOGGER.debug("Resolved safe path: %s -> %s", path, full_path)
     return full_path
@@ -12,7 +12,11 @@ from homeassistant.core import HomeAssistant, callback
 
 _LOGGER = logging.getLogger(__name__)
 
-async def _async_start_watcher(hass: HomeAssistant):
+# Open update subscriptions, the watcher only runs while there are any
+SUBSCRIBERS_KEY = "code_mirror_subscribers"
+
+@callback
+def _async_start_watcher(hass: HomeAssistant):
     """Start the filesystem watcher task."""
     if "code_mirror_watcher" not in hass.data:
         _LOGGER.debug("Starting CodeMirror filesystem watcher")
@@ -22,22 +26,13 @@ async def _async_start_watcher(hass: HomeAssistant):
 
 @callback
 def async_register_websockets(hass: HomeAssistant):
-    """Register websocket commands."""
+    """Register websocket commands.
+
+    The watcher is started by the first subscription rather than here, so
+    nothing wakes up while the panel is not open.
+    """
     _LOGGER.debug("Registering CodeMirror websocket commands")
     websocket_api.async_register_command(hass, websocket_subscribe_updates)
-    
-    @callback
-    def async_start_watcher_callback(_: Any = None):
-        """Start watcher callback."""
-        hass.async_create_task(_async_start_watcher(hass))
-
-    # If HA is already running, start immediately
-    from homeassistant.core import CoreState
-    if hass.state == CoreState.running:
-        async_start_watcher_callback()
-    else:
-        from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, async_start_watcher_callback)
 
 @callback
 def async_stop_watcher(hass: HomeAssistant):
@@ -49,7 +44,6 @@ def async_stop_watcher(hass: HomeAssistant):
 
 async def async_watch_filesystem(hass: HomeAssistant):
     """Background task to watch for filesystem changes."""
-    import time
     # Local changes fire immediately via FileManager
     
     try:
@@ -80,8 +74,22 @@ async def websocket_subscribe_updates(hass: HomeAssistant, connection: websocket
         connection.send_message(websocket_api.event_message(msg["id"], event.data))
 
     # Standard subscription pattern
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        "code_mirror_update", forward_update
-    )
+    unsub = hass.bus.async_listen("code_mirror_update", forward_update)
+    subscribers: set = hass.data.setdefault(SUBSCRIBERS_KEY, set())
+
+    @callback
+    def unsubscribe():
+        """Stop forwarding updates, stopping the watcher after the last subscription."""
+        unsub()
+        # Subscriptions made before the config entry was unloaded are not counted anymore
+        if hass.data.get(SUBSCRIBERS_KEY) is not subscribers:
+            return
+        subscribers.discard(unsubscribe)
+        if not subscribers:
+            async_stop_watcher(hass)
+
+    subscribers.add(unsubscribe)
+    _async_start_watcher(hass)
+    connection.subscriptions[msg["id"]] = unsubscribe
     
     connection.send_result(msg["id"])
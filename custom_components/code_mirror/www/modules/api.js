@@ -169,6 +169,11 @@ export async function fetchWithAuth(url, options = {}) {
     throw new Error(errorMessage);
   }
 
+  // Binary responses (e.g. streamed ZIP archives) are returned as a Blob
+  if (options.responseType === "blob") {
+    return response.blob();
+  }
+
   return response.json();
 }
 
@@ -198,11 +203,18 @@ export async function initWebSocketSubscription(retries = 0) {
       try {
           await conn.subscribeMessage(
             (event) => {
+              // Remember a tree change even if a later event of the same burst is not one,
+              // a batched event lists every action it stands for
+              const actions = event ? (event.actions || [event.action]) : [];
+              if (actions.some(action => ["create", "delete", "rename", "create_folder", "upload", "upload_folder"].includes(action))) {
+                  state._wsTreeChanged = true;
+              }
               if (state._wsUpdateTimer) clearTimeout(state._wsUpdateTimer);
               state._wsUpdateTimer = setTimeout(() => {
                   if (updateCallbacks.checkFileUpdates) updateCallbacks.checkFileUpdates();
                   
-                  if (event && ["create", "delete", "rename", "create_folder", "upload", "upload_folder"].includes(event.action)) {
+                  if (state._wsTreeChanged) {
+                      state._wsTreeChanged = false;
                       if (updateCallbacks.loadFiles) updateCallbacks.loadFiles();
                   }
               }, 500);
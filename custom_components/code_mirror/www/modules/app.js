@@ -256,6 +256,7 @@ import {
   readFileAsText as readFileAsTextImpl,
   readFileAsBase64 as readFileAsBase64Impl,
   uploadFile as uploadFileImpl,
+  uploadFileData as uploadFileDataImpl,
   triggerFolderUpload as triggerFolderUploadImpl,
   handleFolderUpload as handleFolderUploadImpl,
   registerDownloadsUploadsCallbacks
@@ -449,8 +450,7 @@ export async function loadFiles() {
       state.fileTree = {};
       result.folders.forEach(folder => {
         state.fileTree[folder.name] = {
-          _path: folder.path,
-          _childCount: folder.childCount || 0
+          _path: folder.path
         };
       });
       state.fileTree._files = result.files || [];
@@ -535,6 +535,14 @@ export async function loadFile(path) {
       const data = await fetchWithAuth(
         `${API_BASE}?action=read_file&path=${encodeURIComponent(path)}&_t=${Date.now()}`
       );
+      // Files too large to be sent inline come without content, fetch them raw
+      if (data.content === null) {
+          const blob = await fetchWithAuth(
+            `${API_BASE}?action=serve_file&path=${encodeURIComponent(path)}&_t=${Date.now()}`,
+            { responseType: "blob" }
+          );
+          data.content = data.is_base64 ? await readFileAsBase64Impl(blob) : await readFileAsTextImpl(blob);
+      }
       // loadFile must now return the full data object, not just data.content
       return data; // returns {content: ..., is_base64: ...}
     } catch (error) {
@@ -1120,6 +1128,7 @@ export const handleFileUpload = handleFileUploadImpl;
 export const readFileAsText = readFileAsTextImpl;
 export const readFileAsBase64 = readFileAsBase64Impl;
 export const uploadFile = uploadFileImpl;
+export const uploadFileData = uploadFileDataImpl;
 export const triggerFolderUpload = triggerFolderUploadImpl;
 export const handleFolderUpload = handleFolderUploadImpl;
 
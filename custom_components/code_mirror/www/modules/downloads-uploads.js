@@ -24,7 +24,7 @@ import { state, elements } from './state.js';
 import { fetchWithAuth } from './api.js';
 import { API_BASE } from './constants.js';
 import { showToast, showGlobalLoading, hideGlobalLoading, showConfirmDialog } from './ui.js';
-import { isTextFile, formatBytes } from './utils.js';
+import { formatBytes } from './utils.js';
 
 // Callbacks for cross-module functions
 let callbacks = {
@@ -104,18 +104,14 @@ export async function downloadFileByPath(path) {
   // Perform the actual download
   try {
     showGlobalLoading(`Downloading ${filename}...`);
-    const data = await fetchWithAuth(
-      `${API_BASE}?action=read_file&path=${encodeURIComponent(path)}&_t=${Date.now()}`
+    // Fetched raw rather than base64 encoded in JSON, so large files download too
+    const blob = await fetchWithAuth(
+      `${API_BASE}?action=serve_file&path=${encodeURIComponent(path)}&_t=${Date.now()}`,
+      { responseType: "blob" }
     );
     hideGlobalLoading();
 
-    if (data && data.content !== undefined) {
-      const isBinary = data.is_base64 || false;
-      const mimeType = data.mime_type || "application/octet-stream";
-      downloadContent(filename, data.content, isBinary, mimeType);
-    } else {
-      showToast(`Failed to download ${filename}`, "error");
-    }
+    downloadContent(filename, blob, false, blob.type || "application/octet-stream");
   } catch (error) {
     hideGlobalLoading();
     showToast(`Failed to download ${filename}: ${error.message}`, "error");
@@ -179,34 +175,25 @@ export async function downloadFolder(path) {
   try {
     showGlobalLoading("Preparing download...");
 
-    const data = await fetchWithAuth(
-      `${API_BASE}?action=download_folder&path=${encodeURIComponent(path)}`
+    // The archive is streamed back as a binary attachment
+    const blob = await fetchWithAuth(
+      `${API_BASE}?action=download_folder&path=${encodeURIComponent(path)}`,
+      { responseType: "blob" }
     );
 
     hideGlobalLoading();
 
-    if (data.success && data.data) {
-      // Decode base64 to binary
-      const binaryString = atob(data.data);
-      const bytes = new Uint8Array(binaryString.length);
-      for (let i = 0; i < binaryString.length; i++) {
-        bytes[i] = binaryString.charCodeAt(i);
-      }
-
-      // Create blob and download
-      const blob = new Blob([bytes], { type: "application/zip" });
-      const url = URL.createObjectURL(blob);
-
-      const a = document.createElement("a");
-      a.href = url;
-      a.download = data.filename || `${path.split("/").pop()}.zip`;
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-      URL.revokeObjectURL(url);
+    const filename = `${path.split("/").pop() || "download"}.zip`;
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = filename;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    setTimeout(() => URL.revokeObjectURL(url), 1000);
 
-      showToast(`Downloaded ${data.filename}`, "success");
-    }
+    showToast(`Downloaded ${filename}`, "success");
   } catch (error) {
     showToast("Failed to download folder: " + error.message, "error");
   }
@@ -238,21 +225,29 @@ export async function downloadSelectedItems() {
   try {
     showGlobalLoading("Preparing bulk download...");
 
-    const response = await fetchWithAuth(API_BASE, {
+    // The archive is streamed back as a binary attachment
+    const blob = await fetchWithAuth(API_BASE, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ action: "download_multi", paths }),
+      responseType: "blob",
     });
 
     hideGlobalLoading();
 
-    if (response.success && response.data) {
-      downloadContent(response.filename, response.data, true, "application/zip");
-      showToast(`Downloaded ${paths.length} items`, "success");
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = "download.zip";
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    setTimeout(() => URL.revokeObjectURL(url), 1000);
+
+    showToast(`Downloaded ${paths.length} items`, "success");
 
-      // Exit selection mode after download
-      if (callbacks.toggleSelectionMode) callbacks.toggleSelectionMode();
-    }
+    // Exit selection mode after download
+    if (callbacks.toggleSelectionMode) callbacks.toggleSelectionMode();
   } catch (error) {
     hideGlobalLoading();
     showToast("Failed to download items: " + error.message, "error");
@@ -287,14 +282,6 @@ export async function processUploads(files, targetFolder = null) {
     showGlobalLoading(`Uploading ${processedCount} of ${totalFiles} file(s): ${file.name}...`);
 
     try {
-      const isBinaryFile = !isTextFile(file.name);
-      let content;
-      if (isBinaryFile) {
-        content = await readFileAsBase64(file);
-      } else {
-        content = await readFileAsText(file);
-      }
-
       let filePath = basePath ? `${basePath}/${file.name}` : file.name;
 
       // Check if file exists
@@ -312,11 +299,11 @@ export async function processUploads(files, targetFolder = null) {
           if (!overwrite) {
             continue; // Skip this file - don't increment successCount
           }
-          await uploadFile(filePath, content, true, isBinaryFile);
+          await uploadFileData(filePath, file, true);
           successCount++; // Only increment on successful upload
         }
       } else {
-        await uploadFile(filePath, content, false, isBinaryFile);
+        await uploadFileData(filePath, file, false);
         successCount++; // Only increment on successful upload
       }
     } catch (error) {
@@ -388,6 +375,25 @@ export async function uploadFile(path, content, overwrite = false, is_base64 = f
   }
 }
 
+/**
+ * Uploads a File or Blob to the server as is
+ * Sent as a multipart form so the server can stream it to disk without
+ * base64, the file must come after the other fields
+ */
+export async function uploadFileData(path, file, overwrite = false) {
+  const formData = new FormData();
+  formData.append("action", "upload_file");
+  formData.append("path", path);
+  formData.append("overwrite", String(overwrite));
+  formData.append("file", file);
+
+  await fetchWithAuth(API_BASE, {
+    method: "POST",
+    body: formData,
+  });
+  return true;
+}
+
 /**
  * Triggers the folder upload input click
  */
@@ -436,16 +442,16 @@ export async function handleFolderUpload(event) {
     try {
       showGlobalLoading("Uploading and extracting folder...");
 
-      const zipData = await readFileAsBase64(file);
+      // Sent as a multipart form so the server can stream the archive to disk,
+      // the file must come after the other fields
+      const formData = new FormData();
+      formData.append("action", "upload_folder");
+      formData.append("path", targetPath);
+      formData.append("file", file);
 
       const response = await fetchWithAuth(API_BASE, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          action: "upload_folder",
-          path: targetPath,
-          zip_data: zipData,
-        }),
+        body: formData,
       });
 
       hideGlobalLoading();
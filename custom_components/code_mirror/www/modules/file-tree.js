@@ -940,8 +940,7 @@ function updateFileTreeWithLoadedDirectory(parentPath, folders, files) {
   folders.forEach(folder => {
     if (!current[folder.name]) {
       current[folder.name] = {
-        _path: folder.path,
-        _childCount: folder.childCount || 0
+        _path: folder.path
       };
     }
   });